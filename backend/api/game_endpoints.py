@@ -3,16 +3,25 @@ Enhanced Game API Endpoints
 Refactored endpoints using the new architecture.
 """
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
+from functools import lru_cache
+import hashlib
+import numpy as np
+import orjson
 import torch
 
-from models.game_models import ComponentBuild, SimulationResult, PlayerProgress, Hint
-from core.levels.manager import levels_manager
+from models.game_models import ComponentBuild, Hint
+from core.levels.manager import get_levels_manager
 from core.engine.simulation import simulation_engine
+from core.engine.batching import simulation_batcher
 from core.education.hints import hint_system
-from core.education.progress import concept_tracker, learning_analytics
+from core.education.progress import concept_tracker, learning_analytics, player_store
 from core.components.registry import component_registry
+from config.config_loader import config_loader
+from core.caching import TTLCache
 
 # API Models
 class TrainingData(BaseModel):
@@ -26,6 +35,7 @@ class GameBuild(BaseModel):
 class HintRequest(BaseModel):
     level_id: int
     build: Optional[ComponentBuild] = None
+    build_hash: Optional[str] = None  # From a prior /simulate-build response
     attempt_count: int = 1
     time_spent: int = 0
 
@@ -36,8 +46,16 @@ class ProgressUpdate(BaseModel):
     time_taken: int
     attempts: int = 1
 
+# Recent validation results from /simulate-build, reused by /hint
+_validation_cache = TTLCache(maxsize=1024, ttl=60)
+
+def _build_hash(components: List[Dict[str, Any]], level_id: int) -> str:
+    """Stable fingerprint of a build for a level"""
+    payload = orjson.dumps({"level_id": level_id, "components": components}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 # Router
-game_router = APIRouter(prefix="/api", tags=["game"])
+game_router = APIRouter(prefix="/api", tags=["game"], default_response_class=ORJSONResponse)
 
 @game_router.get("/health")
 async def health_check():
@@ -48,13 +66,11 @@ async def health_check():
         "version": "2.0.0-enhanced"
     }
 
-@game_router.get("/levels/{level_id}")
-async def get_level(level_id: int):
-    """Get level configuration and requirements"""
-    level_config = levels_manager.get_level(level_id)
-    
+def _build_level_payload(level_id: int) -> Optional[Dict[str, Any]]:
+    """Build the level response payload"""
+    level_config = get_levels_manager().get_level(level_id)
     if not level_config:
-        raise HTTPException(status_code=404, detail="Level not found")
+        return None
     
     # Get available components for this level
     available_components = []
@@ -65,7 +81,7 @@ async def get_level(level_id: int):
                 "id": component.id,
                 "name": component.name,
                 "description": component.description,
-                "type": component.type.value,
+                "type": component.type,
                 "icon": component.icon,
                 "educational_note": component.educational_note
             })
@@ -80,9 +96,35 @@ async def get_level(level_id: int):
         "success_criteria": level_config.success_criteria,
         "educational_content": level_config.educational_content,
         "type": level_config.type,
-        "difficulty": levels_manager.get_level_difficulty_rating(level_id)
+        "difficulty": get_levels_manager().get_level_difficulty_rating(level_id)
     }
 
+@lru_cache(maxsize=64)
+def _level_payload_json(level_id: int) -> Optional[bytes]:
+    """The level response payload, encoded once (cached - registry and levels are static after boot)"""
+    payload = _build_level_payload(level_id)
+    return None if payload is None else orjson.dumps(payload)
+
+# Drop cached payloads whenever the underlying registry or config changes
+component_registry.add_change_listener(_level_payload_json.cache_clear)
+config_loader.add_reload_listener(_level_payload_json.cache_clear)
+
+def warm_level_payloads():
+    """Encode every level payload up front so no request pays the first-hit build"""
+    for level_id in get_levels_manager().levels:
+        _level_payload_json(level_id)
+
+@game_router.get("/levels/{level_id}")
+async def get_level(level_id: int):
+    """Get level configuration and requirements"""
+    content = _level_payload_json(level_id)
+    
+    if content is None:
+        raise HTTPException(status_code=404, detail="Level not found")
+    
+    # Already-encoded bytes skip response serialization entirely
+    return Response(content=content, media_type="application/json")
+
 @game_router.post("/simulate-build")
 async def simulate_build(build_request: GameBuild, background_tasks: BackgroundTasks):
     """Simulate a player's component build"""
@@ -93,8 +135,8 @@ async def simulate_build(build_request: GameBuild, background_tasks: BackgroundT
             metadata={"level_id": build_request.level_id}
         )
         
-        # Run simulation
-        result = simulation_engine.simulate_build(
+        # Run simulation off the event loop, micro-batched with concurrent requests
+        result = await simulation_batcher.submit(
             component_build, 
             build_request.level_id
         )
@@ -110,6 +152,10 @@ async def simulate_build(build_request: GameBuild, background_tasks: BackgroundT
             score=result.score
         )
         
+        build_hash = _build_hash(build_request.components, build_request.level_id)
+        if result.validation_result:
+            _validation_cache.set(build_hash, (component_build, result.validation_result))
+        
         return {
             "success": result.success,
             "score": result.score,
@@ -124,52 +170,66 @@ async def simulate_build(build_request: GameBuild, background_tasks: BackgroundT
                     "hint": issue.hint
                 }
                 for issue in (result.validation_result.issues if result.validation_result else [])
-            ]
+            ],
+            "build_hash": build_hash
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
 
+# Response for too few drawings - same fields a SimulationResult would encode to, built once
+_NOT_ENOUGH_EXAMPLES_RESPONSE = orjson.dumps({
+    "success": False,
+    "score": 0.0,
+    "message": "Need at least 3 training examples!",
+    "visual_data": None,
+    "validation_result": None,
+    "educational_feedback": ["Draw more shapes to give your AI enough examples to learn from."],
+    "concept_progress": {}
+})
+
+def _train_shape_classifier_sync(training_data: TrainingData):
+    """Blocking part of shape classifier training (runs in the threadpool)"""
+    if len(training_data.drawings) < 3:
+        return Response(content=_NOT_ENOUGH_EXAMPLES_RESPONSE, media_type="application/json")
+    
+    # Simulate training with a simple scoring system
+    # In real implementation, this would use the actual ML training
+    accuracy = min(0.95, 0.6 + len(training_data.drawings) * 0.05)
+    success = accuracy >= 0.8
+    
+    # Compute the curves in one vectorized pass, then zip into per-epoch records
+    epochs = np.arange(min(30, len(training_data.drawings) * 3))
+    losses = 1.0 - epochs * 0.02
+    accuracies = np.minimum(accuracy, epochs * 0.03)
+    training_history = [
+        {"epoch": epoch, "loss": loss, "accuracy": acc}
+        for epoch, loss, acc in zip((epochs + 1).tolist(), losses.tolist(), accuracies.tolist())
+    ]
+    
+    return {
+        "success": success,
+        "score": accuracy,
+        "message": f"AI trained! Final accuracy: {accuracy:.1%}",
+        "visual_data": {
+            "training_history": training_history,
+            "final_accuracy": accuracy,
+            "training_examples": len(training_data.drawings)
+        },
+        "educational_feedback": [
+            f"Your AI learned to recognize shapes from {len(training_data.drawings)} examples!",
+            "More training examples generally lead to better accuracy.",
+            "The neural network adjusted its weights during training to improve recognition."
+        ]
+    }
+
 @game_router.post("/train-shape-classifier")
 async def train_shape_classifier(training_data: TrainingData):
     """Train a shape classifier with user drawings (Level 1 specific)"""
     try:
         # This is a legacy endpoint for Level 1 - we'll keep it for compatibility
         # but route it through our new simulation system
-        
-        if len(training_data.drawings) < 3:
-            return SimulationResult(
-                success=False,
-                score=0.0,
-                message="Need at least 3 training examples!",
-                educational_feedback=["Draw more shapes to give your AI enough examples to learn from."]
-            )
-        
-        # Simulate training with a simple scoring system
-        # In real implementation, this would use the actual ML training
-        accuracy = min(0.95, 0.6 + len(training_data.drawings) * 0.05)
-        success = accuracy >= 0.8
-        
-        training_history = [
-            {"epoch": i + 1, "loss": 1.0 - (i * 0.02), "accuracy": min(accuracy, i * 0.03)}
-            for i in range(min(30, len(training_data.drawings) * 3))
-        ]
-        
-        return {
-            "success": success,
-            "score": accuracy,
-            "message": f"AI trained! Final accuracy: {accuracy:.1%}",
-            "visual_data": {
-                "training_history": training_history,
-                "final_accuracy": accuracy,
-                "training_examples": len(training_data.drawings)
-            },
-            "educational_feedback": [
-                f"Your AI learned to recognize shapes from {len(training_data.drawings)} examples!",
-                "More training examples generally lead to better accuracy.",
-                "The neural network adjusted its weights during training to improve recognition."
-            ]
-        }
+        return await run_in_threadpool(_train_shape_classifier_sync, training_data)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Training failed: {str(e)}")
@@ -179,16 +239,27 @@ async def get_hint(hint_request: HintRequest):
     """Get an intelligent hint for the current situation"""
     try:
         hint = None
+        analysis = None
+        build = hint_request.build
+        validation_result = None
+        
+        # Reuse the validation from a recent /simulate-build of the same build on the same level
+        if hint_request.build_hash:
+            cached = _validation_cache.get(hint_request.build_hash)
+            if (cached and cached[0].metadata.get("level_id") == hint_request.level_id
+                    and (build is None or build.components == cached[0].components)):
+                build, validation_result = cached
         
-        if hint_request.build:
+        if build:
             # Analyze current build for contextual hint
-            validation_result = simulation_engine.validate_build(
-                hint_request.build, 
-                hint_request.level_id
-            )
+            if validation_result is None:
+                validation_result = simulation_engine.validate_build(
+                    build, 
+                    hint_request.level_id
+                )
             
             analysis = hint_system.analyze_attempt(
-                hint_request.build,
+                build,
                 validation_result,
                 hint_request.level_id,
                 hint_request.attempt_count,
@@ -209,25 +280,29 @@ async def get_hint(hint_request: HintRequest):
                 difficulty=1
             )
         
-        return {
+        response = {
             "content": hint.content,
             "type": hint.type,
-            "difficulty": hint.difficulty,
-            "visual_highlight": hint.visual_highlight
+            "difficulty": hint.difficulty
         }
+        # Only send the highlight when there is one
+        if hint.visual_highlight is not None:
+            response["visual_highlight"] = hint.visual_highlight
+        
+        # Everything needed is copied into the response; recycle the objects
+        hint_system.release(hint, analysis)
+        
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Hint generation failed: {str(e)}")
 
-@game_router.post("/progress/update")
-async def update_progress(progress_update: ProgressUpdate):
-    """Update player progress after level completion"""
-    try:
-        # This would normally load from database - for now using in-memory
-        player_progress = PlayerProgress(player_id=progress_update.player_id)
-        
+def _apply_progress_update(progress_update: ProgressUpdate) -> Dict[str, Any]:
+    """Record a level completion and build the response (runs in the threadpool)"""
+    # Held for the whole update so concurrent progress reads never see it half-applied
+    with player_store.locked(progress_update.player_id) as player_progress:
         # Mark level complete
-        levels_manager.mark_level_complete(
+        get_levels_manager().mark_level_complete(
             progress_update.level_id,
             player_progress,
             progress_update.score,
@@ -236,7 +311,7 @@ async def update_progress(progress_update: ProgressUpdate):
         )
         
         # Update concept mastery
-        level_concepts = levels_manager.get_level_concepts(progress_update.level_id)
+        level_concepts = get_levels_manager().get_level_concepts(progress_update.level_id)
         for concept in level_concepts:
             concept_tracker.update_concept_mastery(
                 player_progress,
@@ -247,8 +322,8 @@ async def update_progress(progress_update: ProgressUpdate):
         
         # Get updated progress summary
         mastery_summary = concept_tracker.get_mastery_summary(player_progress)
-        available_levels = levels_manager.get_available_levels(player_progress)
-        next_level = levels_manager.get_next_level(progress_update.level_id, player_progress)
+        available_levels = get_levels_manager().get_available_levels(player_progress)
+        next_level = get_levels_manager().get_next_level(progress_update.level_id, player_progress)
         
         return {
             "updated_progress": {
@@ -260,33 +335,42 @@ async def update_progress(progress_update: ProgressUpdate):
             "mastery_summary": mastery_summary,
             "achievements_unlocked": []  # TODO: Implement achievements system
         }
+
+@game_router.post("/progress/update")
+async def update_progress(progress_update: ProgressUpdate):
+    """Update player progress after level completion"""
+    try:
+        return await run_in_threadpool(_apply_progress_update, progress_update)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Progress update failed: {str(e)}")
 
-@game_router.get("/progress/{player_id}")
-async def get_player_progress(player_id: str):
-    """Get comprehensive player progress and analytics"""
-    try:
-        # Create dummy progress for now - would load from database in real implementation
-        player_progress = PlayerProgress(player_id=player_id)
-        
-        # Get analytics insights
-        player_insights = learning_analytics.get_player_insights(player_id)
+def _collect_player_progress(player_id: str) -> Dict[str, Any]:
+    """Assemble the progress payload for a player (runs in the threadpool)"""
+    # Get analytics insights
+    player_insights = learning_analytics.get_player_insights(player_id)
+    
+    with player_store.locked(player_id) as player_progress:
         mastery_summary = concept_tracker.get_mastery_summary(player_progress)
-        available_levels = levels_manager.get_available_levels(player_progress)
-        concepts_learned = levels_manager.get_concepts_learned(player_progress)
+        available_levels = get_levels_manager().get_available_levels(player_progress)
+        concepts_learned = get_levels_manager().get_concepts_learned(player_progress)
         
         return {
             "player_id": player_id,
             "current_level": player_progress.current_level,
-            "completed_levels": player_progress.completed_levels,
+            "completed_levels": dict(player_progress.completed_levels),
             "available_levels": available_levels,
             "concepts_learned": concepts_learned,
             "mastery_summary": mastery_summary,
             "learning_insights": player_insights,
-            "achievements": player_progress.achievements
+            "achievements": list(player_progress.achievements)
         }
+
+@game_router.get("/progress/{player_id}")
+async def get_player_progress(player_id: str):
+    """Get comprehensive player progress and analytics"""
+    try:
+        return await run_in_threadpool(_collect_player_progress, player_id)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Progress retrieval failed: {str(e)}")
@@ -295,7 +379,7 @@ async def get_player_progress(player_id: str):
 async def get_difficulty_analytics():
     """Get analytics about level difficulty across all players"""
     try:
-        difficulty_report = learning_analytics.generate_difficulty_report()
+        difficulty_report = await run_in_threadpool(learning_analytics.generate_difficulty_report)
         return {
             "difficulty_analysis": difficulty_report,
             "recommendations": [
@@ -310,20 +394,8 @@ async def get_difficulty_analytics():
 async def get_all_components():
     """Get all available components in the system"""
     try:
-        all_components = []
-        for level_id in range(1, 5):  # Currently implemented levels
-            level_components = component_registry.get_components_for_level(level_id)
-            for component in level_components:
-                if not any(c["id"] == component.id for c in all_components):
-                    all_components.append({
-                        "id": component.id,
-                        "name": component.name,
-                        "description": component.description,
-                        "type": component.type.value,
-                        "icon": component.icon,
-                        "educational_note": component.educational_note,
-                        "level_introduced": component.level_introduced
-                    })
+        # Serialized once per registry version; copy the list so callers can't mutate the cache
+        all_components = list(component_registry.all_components_serialized)
         
         return {"components": all_components}
         
@@ -4,9 +4,18 @@ Loads game configuration from YAML files for better maintainability.
 """
 import yaml
 import os
+import pickle
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
+# Prefer the libyaml C parser when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_CACHE_SUFFIX = ".pkl"
+
 class ConfigLoader:
     """Loads and manages game configuration from YAML files"""
     
@@ -18,16 +27,20 @@ class ConfigLoader:
         self.config_dir = Path(config_dir)
         self._levels_config = None
         self._components_config = None
+        self._reload_listeners = []
+        self._levels: Dict[int, Dict[str, Any]] = {}
+        self._components: Dict[str, Dict[str, Any]] = {}
+        self._level_concepts: Dict[int, List[str]] = {}
+        self._component_to_levels: Dict[str, List[int]] = {}
         self._load_configs()
     
-    def _load_configs(self):
+    def _load_configs(self, use_cache: bool = True):
         """Load all configuration files"""
         try:
             # Load levels configuration
             levels_file = self.config_dir / "levels.yaml"
             if levels_file.exists():
-                with open(levels_file, 'r') as f:
-                    self._levels_config = yaml.safe_load(f)
+                self._levels_config = self._load_yaml(levels_file, use_cache)
             else:
                 print(f"Warning: levels.yaml not found at {levels_file}")
                 self._levels_config = {"levels": {}, "concepts": {}}
@@ -35,8 +48,7 @@ class ConfigLoader:
             # Load components configuration
             components_file = self.config_dir / "components.yaml"
             if components_file.exists():
-                with open(components_file, 'r') as f:
-                    self._components_config = yaml.safe_load(f)
+                self._components_config = self._load_yaml(components_file, use_cache)
             else:
                 print(f"Warning: components.yaml not found at {components_file}")
                 self._components_config = {"components": {}, "categories": {}}
@@ -46,28 +58,67 @@ class ConfigLoader:
             # Initialize with empty configs as fallback
             self._levels_config = {"levels": {}, "concepts": {}}
             self._components_config = {"components": {}, "categories": {}}
+        
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """Build lookup tables derived from the loaded configuration"""
+        self._levels = dict((self._levels_config or {}).get("levels") or {})
+        self._components = dict((self._components_config or {}).get("components") or {})
+        self._level_concepts = {
+            level_id: level_config.get("concepts", [])
+            for level_id, level_config in self._levels.items()
+        }
+        
+        component_to_levels: Dict[str, List[int]] = {}
+        for level_id, level_config in self._levels.items():
+            for component_id in level_config.get("available_components", []):
+                component_to_levels.setdefault(component_id, []).append(level_id)
+        for levels in component_to_levels.values():
+            levels.sort()
+        self._component_to_levels = component_to_levels
+    
+    def _load_yaml(self, path: Path, use_cache: bool = True) -> Dict[str, Any]:
+        """Parse a YAML file, reusing a pickled sidecar while the source is unchanged"""
+        stat = path.stat()
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        cache_file = path.with_name(path.name + _CACHE_SUFFIX)
+        
+        if use_cache and cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    cached = pickle.load(f)
+                if cached.get("fingerprint") == fingerprint:
+                    return cached["data"]
+            except Exception:
+                pass  # Stale or corrupt cache - fall through and re-parse
+        
+        with open(path, 'r') as f:
+            data = yaml.load(f, Loader=_YamlLoader)
+        
+        try:
+            with open(cache_file, 'wb') as f:
+                pickle.dump({"fingerprint": fingerprint, "data": data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            pass  # Read-only config dir - just skip caching
+        
+        return data
     
     def get_level_config(self, level_id: int) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific level"""
-        if not self._levels_config:
-            return None
-        
-        return self._levels_config.get("levels", {}).get(level_id)
+        return self._levels.get(level_id)
     
     def get_all_levels(self) -> Dict[int, Dict[str, Any]]:
         """Get all level configurations"""
-        return self._levels_config.get("levels", {})
+        return self._levels
     
     def get_component_config(self, component_id: str) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific component"""
-        if not self._components_config:
-            return None
-        
-        return self._components_config.get("components", {}).get(component_id)
+        return self._components.get(component_id)
     
     def get_all_components(self) -> Dict[str, Dict[str, Any]]:
         """Get all component configurations"""
-        return self._components_config.get("components", {})
+        return self._components
     
     def get_component_categories(self) -> Dict[str, Dict[str, Any]]:
         """Get component categories for UI organization"""
@@ -79,14 +130,7 @@ class ConfigLoader:
     
     def get_levels_for_component(self, component_id: str) -> List[int]:
         """Get all levels where a component is available"""
-        levels = []
-        
-        for level_id, level_config in self.get_all_levels().items():
-            available_components = level_config.get("available_components", [])
-            if component_id in available_components:
-                levels.append(level_id)
-        
-        return sorted(levels)
+        return list(self._component_to_levels.get(component_id, ()))
     
     def get_components_for_level(self, level_id: int) -> List[str]:
         """Get all components available for a specific level"""
@@ -98,11 +142,7 @@ class ConfigLoader:
     
     def get_level_concepts(self, level_id: int) -> List[str]:
         """Get concepts taught in a specific level"""
-        level_config = self.get_level_config(level_id)
-        if not level_config:
-            return []
-        
-        return level_config.get("concepts", [])
+        return self._level_concepts.get(level_id, [])
     
     def get_concept_dependencies(self) -> Dict[str, List[str]]:
         """Get concept dependency relationships"""
@@ -146,9 +186,16 @@ class ConfigLoader:
         
         return issues
     
+    def add_reload_listener(self, listener):
+        """Register a callback invoked after configuration files are reloaded"""
+        self._reload_listeners.append(listener)
+    
     def reload_configs(self):
         """Reload configuration files (useful for development)"""
-        self._load_configs()
+        # Always re-parse the YAML and refresh the pickled sidecars
+        self._load_configs(use_cache=False)
+        for listener in self._reload_listeners:
+            listener()
 
 # Global config loader instance
 config_loader = ConfigLoader()
\ No newline at end of file
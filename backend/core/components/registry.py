@@ -2,12 +2,40 @@
 Component Registry System
 Manages all available components and their implementations.
 """
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Tuple
+from functools import lru_cache
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 from models.game_models import Component, ComponentType, TensorSpec
 from collections import defaultdict
 
+# Largest layer dimension kept in the shared cache - output_size comes from client
+# parameters, so bigger layers are built per call instead of pinned for the process lifetime
+_MAX_CACHED_FEATURES = 64
+
+@lru_cache(maxsize=256)
+def _cached_linear(in_features: int, out_features: int) -> nn.Linear:
+    """Shared linear layer per shape - avoids re-allocating and re-initializing weights per call"""
+    return nn.Linear(in_features, out_features).eval()
+
+def _get_linear(in_features: int, out_features: int) -> nn.Linear:
+    """Linear layer for a shape, shared when both dimensions are small enough to cache"""
+    if in_features <= _MAX_CACHED_FEATURES and out_features <= _MAX_CACHED_FEATURES:
+        return _cached_linear(in_features, out_features)
+    return nn.Linear(in_features, out_features).eval()
+
+# Default tensor_add operand, sliced to the input's feature size
+_DEFAULT_ADD_CONSTANT = torch.tensor([1.0, 1.0, 1.0, 1.0])
+
+def multiply_add(x: torch.Tensor, **kwargs) -> torch.Tensor:
+    """tensor_multiply followed by tensor_add as one fused op: constant + multiplier * x"""
+    multiplier = kwargs.get('multiplier', 2.0)
+    constant = kwargs.get('constant', _DEFAULT_ADD_CONSTANT[:x.shape[-1]])
+    if isinstance(multiplier, torch.Tensor):
+        return torch.addcmul(constant, x, multiplier)
+    return torch.add(constant, x, alpha=multiplier)
+
 class ComponentRegistry:
     """Central registry for all game components"""
     
@@ -15,6 +43,10 @@ class ComponentRegistry:
         self.components: Dict[str, Component] = {}
         self.implementations: Dict[str, Callable] = {}
         self.level_components: Dict[int, List[str]] = defaultdict(list)
+        self.version = 0
+        self._change_listeners: List[Callable[[], None]] = []
+        self._serialized_components: Optional[List[Dict[str, Any]]] = None
+        self._level_components_cumulative: Optional[Dict[int, Tuple[Component, ...]]] = None
         self._register_core_components()
     
     def register_component(self, component: Component, implementation: Callable):
@@ -25,6 +57,39 @@ class ComponentRegistry:
         # Auto-register to appropriate level
         if component.level_introduced:
             self.level_components[component.level_introduced].append(component.id)
+        
+        self.bump_version()
+    
+    def add_change_listener(self, listener: Callable[[], None]):
+        """Register a callback invoked whenever the registry contents change"""
+        self._change_listeners.append(listener)
+    
+    def bump_version(self):
+        """Mark the registry as changed so derived caches get invalidated"""
+        self.version += 1
+        self._serialized_components = None
+        self._level_components_cumulative = None
+        for listener in self._change_listeners:
+            listener()
+    
+    @property
+    def all_components_serialized(self) -> List[Dict[str, Any]]:
+        """All components as API-ready dicts, ordered by level introduced (built once per registry version)"""
+        if self._serialized_components is None:
+            ordered = sorted(self.components.values(), key=lambda comp: comp.level_introduced)
+            self._serialized_components = [
+                {
+                    "id": component.id,
+                    "name": component.name,
+                    "description": component.description,
+                    "type": component.type,
+                    "icon": component.icon,
+                    "educational_note": component.educational_note,
+                    "level_introduced": component.level_introduced
+                }
+                for component in ordered
+            ]
+        return self._serialized_components
     
     def get_component(self, component_id: str) -> Optional[Component]:
         """Get component definition by ID"""
@@ -36,15 +101,29 @@ class ComponentRegistry:
     
     def get_components_for_level(self, level_id: int) -> List[Component]:
         """Get all components available for a specific level"""
-        available_components = []
+        if level_id < 1:
+            return []
         
-        # Get all components up to and including this level
-        for level in range(1, level_id + 1):
-            for comp_id in self.level_components[level]:
-                if comp_id in self.components:
-                    available_components.append(self.components[comp_id])
+        cumulative = self._get_level_components_cumulative()
+        if not cumulative:
+            return []
         
-        return available_components
+        # Levels past the last one that introduces components see everything
+        return list(cumulative.get(min(level_id, max(cumulative)), ()))
+    
+    def _get_level_components_cumulative(self) -> Dict[int, Tuple[Component, ...]]:
+        """Components available up to and including each level (rebuilt once per registry version)"""
+        if self._level_components_cumulative is None:
+            cumulative: Dict[int, Tuple[Component, ...]] = {}
+            running: List[Component] = []
+            max_level = max(self.level_components, default=0)
+            for level in range(1, max_level + 1):
+                for comp_id in self.level_components.get(level, []):
+                    if comp_id in self.components:
+                        running.append(self.components[comp_id])
+                cumulative[level] = tuple(running)
+            self._level_components_cumulative = cumulative
+        return self._level_components_cumulative
     
     def get_components_by_type(self, component_type: ComponentType) -> List[Component]:
         """Get all components of a specific type"""
@@ -161,12 +240,11 @@ class ComponentRegistry:
     # Implementation functions for core components
     def _neural_layer_impl(self, x: torch.Tensor, **kwargs) -> torch.Tensor:
         """Simple neural layer implementation"""
-        # For educational purposes, create a small linear transformation
+        # For educational purposes, apply a small linear transformation
         input_size = x.shape[-1] if len(x.shape) > 1 else x.shape[0]
         output_size = kwargs.get('output_size', max(2, input_size // 2))
         
-        layer = nn.Linear(input_size, output_size)
-        return layer(x.float())
+        return _get_linear(input_size, output_size)(x.float())
     
     def _relu_activation_impl(self, x: torch.Tensor, **kwargs) -> torch.Tensor:
         """ReLU activation implementation"""
@@ -175,7 +253,7 @@ class ComponentRegistry:
     def _tensor_add_impl(self, x: torch.Tensor, **kwargs) -> torch.Tensor:
         """Tensor addition implementation - adds a constant for educational purposes"""
         # For educational simulation, add a constant tensor
-        constant = kwargs.get('constant', torch.tensor([1.0, 1.0, 1.0, 1.0])[:x.shape[0]])
+        constant = kwargs.get('constant', _DEFAULT_ADD_CONSTANT[:x.shape[-1]])
         return torch.add(x, constant)
     
     def _tensor_multiply_impl(self, x: torch.Tensor, **kwargs) -> torch.Tensor:
@@ -189,14 +267,12 @@ class ComponentRegistry:
         input_size = x.shape[-1] if len(x.shape) > 1 else x.shape[0]
         output_size = kwargs.get('output_size', max(2, input_size // 2))
         
-        layer = nn.Linear(input_size, output_size)
-        return layer(x.float())
+        return _get_linear(input_size, output_size)(x.float())
     
     def _dropout_impl(self, x: torch.Tensor, **kwargs) -> torch.Tensor:
-        """Dropout implementation"""
+        """Dropout implementation (inactive unless training=True is passed)"""
         dropout_rate = kwargs.get('dropout_rate', 0.2)
-        dropout = nn.Dropout(dropout_rate)
-        return dropout(x)
+        return F.dropout(x, dropout_rate, training=kwargs.get('training', False))
 
 # Global component registry instance
 component_registry = ComponentRegistry()
\ No newline at end of file
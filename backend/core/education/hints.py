@@ -2,14 +2,129 @@
 Adaptive Hint System
 Provides intelligent, context-aware hints based on player progress and mistakes.
 """
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from models.game_models import Hint, HintAnalysis, ComponentBuild, ValidationResult, PlayerProgress
-from core.levels.manager import levels_manager
+from core.levels.manager import get_levels_manager
+from config.config_loader import config_loader
 import random
+import threading
+
+@lru_cache(maxsize=256)
+def _cached_level_concepts(level_id: int) -> Tuple[str, ...]:
+    """Concepts taught in a level (level configs are static at runtime)"""
+    return tuple(get_levels_manager().get_level_concepts(level_id))
+
+config_loader.add_reload_listener(_cached_level_concepts.cache_clear)
+
+# Static hint tables, built once at import
+_COMPONENT_NAMES: Mapping[str, str] = MappingProxyType({
+    "neural_layer": "Neural Layer",
+    "activation_relu": "Activation Function", 
+    "dense_layer": "Dense Layer",
+    "dropout": "Dropout",
+    "tensor_add": "Tensor Addition",
+    "tensor_multiply": "Tensor Multiplication"
+})
+
+_CONCEPT_HINT_TABLE: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "basic_assembly": (
+        "Try dragging a component from the library to get started!",
+        "Start by adding some components to build your AI network.",
+        "Click and drag components from the left panel into the center area."
+    ),
+    "network_depth": (
+        "Consider adding more components to make your network more sophisticated.",
+        "Deeper networks with multiple components often perform better.",
+        "Try stacking more layers to give your AI more processing power."
+    ),
+    "neural_networks": (
+        "Every AI needs a brain! Try adding a Neural Layer.",
+        "Neural networks need neurons - add a Neural Layer component.",
+        "Start with a Neural Layer as the foundation of your AI."
+    ),
+    "activation": (
+        "Your network needs non-linearity - try adding an Activation Function.",
+        "Add an Activation Function to help your AI learn complex patterns.",
+        "Activation Functions are essential - they help neurons make decisions."
+    )
+})
+
+_ENCOURAGEMENTS = (
+    "You're on the right track! Try fine-tuning your approach.",
+    "Great progress! Your AI architecture looks promising.",
+    "Almost there! Consider if any components could work better together.",
+    "Nice work! Your network structure shows good understanding.",
+    "Excellent attempt! Small adjustments might give you that extra boost."
+)
+
+# Hint wording indexed by difficulty - 1 (difficulty runs 1-5)
+_MISSING_TEMPLATES = (
+    "Your AI might benefit from including a {name}.",
+    "Your AI might benefit from including a {name}.",
+    "Try adding a {name} component to your network.",
+    "Try adding a {name} component to your network.",
+    "You need to add a {name} component. Look for it in the component library."
+)
+
+_CONNECTION_TEMPLATES = (
+    "Check the order of your components - some work better in specific sequences.",
+    "Check the order of your components - some work better in specific sequences.",
+    "Try rearranging your components. Activation functions usually come after layers.",
+    "Try rearranging your components. Activation functions usually come after layers.",
+    "Components have an optimal order: Layer → Activation → Layer → etc."
+)
+
+def _template_index(difficulty: int) -> int:
+    """Clamp a hint difficulty into an index for the template tables"""
+    return min(max(difficulty, 1), 5) - 1
+
+@lru_cache(maxsize=256)
+def _missing_content(component_id: str, difficulty: int) -> str:
+    """Missing-component wording (pure in its arguments, so safe to memoize)"""
+    component_name = _COMPONENT_NAMES.get(component_id, component_id.title())
+    return _MISSING_TEMPLATES[_template_index(difficulty)].format(name=component_name)
+
+# Dedicated RNG so hint selection doesn't contend on the module-global generator
+_rng = random.Random()
+
+class _ObjectPool:
+    """Bounded free-list of dataclass instances, re-initialised on acquire"""
+    
+    def __init__(self, cls, size: int = 64):
+        self._cls = cls
+        self._size = size
+        self._free = [cls.__new__(cls) for _ in range(size)]
+        self._lock = threading.Lock()
+    
+    def acquire(self, **fields):
+        """Take an instance from the pool (or allocate one) and set its fields"""
+        with self._lock:
+            obj = self._free.pop() if self._free else None
+        if obj is None:
+            return self._cls(**fields)
+        obj.__init__(**fields)
+        return obj
+    
+    def release(self, obj):
+        """Return an instance once the caller has finished with it"""
+        if obj is None or type(obj) is not self._cls:
+            return
+        with self._lock:
+            if len(self._free) < self._size:
+                self._free.append(obj)
+
+_hint_pool = _ObjectPool(Hint)
+_analysis_pool = _ObjectPool(HintAnalysis)
 
 class AdaptiveHintSystem:
     """Intelligent hint generation system that adapts to player needs"""
     
+    # Concepts that are checked by looking for a keyword in the build's component ids
+    _CONCEPT_KEYWORDS = {"neural_networks": "neural", "activation": "activation"}
+    _KEYWORD_TO_CONCEPT = {keyword: concept for concept, keyword in _CONCEPT_KEYWORDS.items()}
+    
     def __init__(self):
         self.hint_templates = self._load_hint_templates()
         self.concept_hints = self._load_concept_hints()
@@ -38,16 +153,22 @@ class AdaptiveHintSystem:
             conceptual_gaps.append("network_depth")
         
         # Check for specific level concepts
-        level_concepts = levels_manager.get_level_concepts(level_id)
-        component_ids = [comp.get("id", "") for comp in build.components]
+        level_concepts = _cached_level_concepts(level_id)
         
-        for concept in level_concepts:
-            if concept == "neural_networks" and not any("neural" in comp_id for comp_id in component_ids):
-                conceptual_gaps.append("neural_networks")
-            elif concept == "activation" and not any("activation" in comp_id for comp_id in component_ids):
-                conceptual_gaps.append("activation")
+        # One pass over the components collects every concept keyword present
+        present = set()
+        for comp in build.components:
+            comp_id = comp.get("id", "")
+            for keyword, concept in self._KEYWORD_TO_CONCEPT.items():
+                if keyword in comp_id:
+                    present.add(concept)
         
-        return HintAnalysis(
+        # Nothing left to flag once every keyword concept is present
+        unmet = self._CONCEPT_KEYWORDS.keys() - present
+        if unmet:
+            conceptual_gaps.extend(concept for concept in level_concepts if concept in unmet)
+        
+        return _analysis_pool.acquire(
             missing_components=missing_components,
             incorrect_connections=incorrect_connections,
             conceptual_gaps=conceptual_gaps,
@@ -94,9 +215,14 @@ class AdaptiveHintSystem:
         
         return False
     
+    def release(self, hint: Optional[Hint] = None, analysis: Optional[HintAnalysis] = None):
+        """Hand a served hint (and its analysis) back to the pools for reuse"""
+        _hint_pool.release(hint)
+        _analysis_pool.release(analysis)
+    
     def get_level_introduction_hints(self, level_id: int) -> List[Hint]:
         """Get introductory hints for a new level"""
-        level_config = levels_manager.get_level(level_id)
+        level_config = get_levels_manager().get_level(level_id)
         if not level_config:
             return []
         
@@ -112,26 +238,8 @@ class AdaptiveHintSystem:
     
     def _generate_missing_component_hint(self, component_id: str, difficulty: int) -> Hint:
         """Generate hint for missing component"""
-        component_names = {
-            "neural_layer": "Neural Layer",
-            "activation_relu": "Activation Function", 
-            "dense_layer": "Dense Layer",
-            "dropout": "Dropout",
-            "tensor_add": "Tensor Addition",
-            "tensor_multiply": "Tensor Multiplication"
-        }
-        
-        component_name = component_names.get(component_id, component_id.title())
-        
-        if difficulty <= 2:
-            content = f"Your AI might benefit from including a {component_name}."
-        elif difficulty <= 4:
-            content = f"Try adding a {component_name} component to your network."
-        else:
-            content = f"You need to add a {component_name} component. Look for it in the component library."
-        
-        return Hint(
-            content=content,
+        return _hint_pool.acquire(
+            content=_missing_content(component_id, difficulty),
             type="structure",
             difficulty=difficulty,
             visual_highlight=component_id
@@ -139,65 +247,30 @@ class AdaptiveHintSystem:
     
     def _generate_concept_hint(self, concept: str, level_id: int, difficulty: int) -> Hint:
         """Generate hint based on missing concepts"""
-        concept_hints = {
-            "basic_assembly": [
-                "Try dragging a component from the library to get started!",
-                "Start by adding some components to build your AI network.",
-                "Click and drag components from the left panel into the center area."
-            ],
-            "network_depth": [
-                "Consider adding more components to make your network more sophisticated.",
-                "Deeper networks with multiple components often perform better.",
-                "Try stacking more layers to give your AI more processing power."
-            ],
-            "neural_networks": [
-                "Every AI needs a brain! Try adding a Neural Layer.",
-                "Neural networks need neurons - add a Neural Layer component.",
-                "Start with a Neural Layer as the foundation of your AI."
-            ],
-            "activation": [
-                "Your network needs non-linearity - try adding an Activation Function.",
-                "Add an Activation Function to help your AI learn complex patterns.",
-                "Activation Functions are essential - they help neurons make decisions."
-            ]
-        }
-        
-        hints_list = concept_hints.get(concept, [f"Consider the concept of {concept} for this level."])
-        hint_index = min(difficulty - 1, len(hints_list) - 1)
+        hints_tuple = _CONCEPT_HINT_TABLE.get(concept)
+        if hints_tuple is None:
+            content = f"Consider the concept of {concept} for this level."
+        else:
+            content = hints_tuple[min(difficulty - 1, len(hints_tuple) - 1)]
         
-        return Hint(
-            content=hints_list[hint_index],
+        return _hint_pool.acquire(
+            content=content,
             type="concept",
             difficulty=difficulty
         )
     
     def _generate_connection_hint(self, connection_issue: str, difficulty: int) -> Hint:
         """Generate hint for connection problems"""
-        if difficulty <= 2:
-            content = "Check the order of your components - some work better in specific sequences."
-        elif difficulty <= 4:
-            content = "Try rearranging your components. Activation functions usually come after layers."
-        else:
-            content = "Components have an optimal order: Layer → Activation → Layer → etc."
-        
-        return Hint(
-            content=content,
+        return _hint_pool.acquire(
+            content=_CONNECTION_TEMPLATES[_template_index(difficulty)],
             type="structure",
             difficulty=difficulty
         )
     
     def _generate_encouragement_hint(self, level_id: int, difficulty: int) -> Hint:
         """Generate encouraging hint when player is close to success"""
-        encouragements = [
-            "You're on the right track! Try fine-tuning your approach.",
-            "Great progress! Your AI architecture looks promising.",
-            "Almost there! Consider if any components could work better together.",
-            "Nice work! Your network structure shows good understanding.",
-            "Excellent attempt! Small adjustments might give you that extra boost."
-        ]
-        
-        return Hint(
-            content=random.choice(encouragements),
+        return _hint_pool.acquire(
+            content=_rng.choice(_ENCOURAGEMENTS),
             type="encouragement", 
             difficulty=difficulty
         )
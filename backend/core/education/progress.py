@@ -2,12 +2,66 @@
 Educational Progress Tracking
 Tracks concept mastery, learning analytics, and adaptive difficulty.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from enum import Enum
 from models.game_models import PlayerProgress, MasteryLevel, ComponentBuild
-from core.levels.manager import levels_manager
+from array import array
+import bisect
 import json
+import os
+import threading
+import time
+from collections import OrderedDict, Counter, defaultdict, deque
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
+import numpy as np
+
+# Monotonic clock for action timestamps - only ever compared against each other
+_now = time.monotonic
+
+# Mastery levels are ranked integers (3 = max)
+_MAX_MASTERY_VALUE = int(max(MasteryLevel))
+
+# Score thresholds for LEARNING, PROFICIENT and EXPERT (ascending), and the level each band maps to
+_MASTERY_THRESHOLDS = (0.7, 0.85, 0.95)
+_MASTERY_LEVELS = (MasteryLevel.NOVICE, MasteryLevel.LEARNING, MasteryLevel.PROFICIENT, MasteryLevel.EXPERT)
+
+# Keys of the mastery breakdown in get_mastery_summary, indexed by rank
+_MASTERY_VALUE_KEYS = tuple(str(level) for level in MasteryLevel)
+
+def _aggregate_level_attempts_numpy(level_index: np.ndarray, attempts: np.ndarray,
+                                    n_levels: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-level (total attempts, player count, completion-rate sum) from flat per-player rows"""
+    total_attempts = np.bincount(level_index, weights=attempts, minlength=n_levels)
+    total_players = np.bincount(level_index, minlength=n_levels).astype(np.float64)
+    completion = np.where(attempts > 0, 1.0 / np.maximum(attempts, 1), 0.0)
+    completion_sum = np.bincount(level_index, weights=completion, minlength=n_levels)
+    return total_attempts, total_players, completion_sum
+
+def _aggregate_level_attempts_loop(level_index, attempts, n_levels):
+    """Loop form of the aggregation kernel, suitable for numba.njit"""
+    total_attempts = np.zeros(n_levels)
+    total_players = np.zeros(n_levels)
+    completion_sum = np.zeros(n_levels)
+    for i in range(level_index.shape[0]):
+        level = level_index[i]
+        total_attempts[level] += attempts[i]
+        total_players[level] += 1.0
+        if attempts[i] > 0:
+            completion_sum[level] += 1.0 / attempts[i]
+    return total_attempts, total_players, completion_sum
+
+# Optional JIT for the analytics kernel (TF_USE_NUMBA=1); NumPy path otherwise
+_aggregate_level_attempts = _aggregate_level_attempts_numpy
+if os.environ.get("TF_USE_NUMBA") == "1":
+    try:
+        import numba
+        _aggregate_level_attempts = numba.njit(cache=True, fastmath=True)(_aggregate_level_attempts_loop)
+        # Compile now so the JIT cost stays out of the request path
+        _aggregate_level_attempts(np.zeros(1, dtype=np.int32), np.ones(1, dtype=np.float64), 1)
+    except ImportError:
+        _aggregate_level_attempts = _aggregate_level_attempts_numpy
 
 class ConceptTracker:
     """Tracks player's understanding and mastery of AI concepts"""
@@ -15,6 +69,7 @@ class ConceptTracker:
     def __init__(self):
         self.concept_definitions = self._load_concept_definitions()
         self.concept_dependencies = self._load_concept_dependencies()
+        self._topo_index = self._build_topological_index()
     
     def track_concept_exposure(self, player_progress: PlayerProgress, concept: str, level_id: int):
         """Track when a player is exposed to a concept"""
@@ -33,17 +88,10 @@ class ConceptTracker:
         # Calculate mastery progression based on performance and attempts
         mastery_score = performance_score * (1.0 / max(1, attempts - 1)) if attempts > 1 else performance_score
         
-        if mastery_score >= 0.95 and current_mastery.value != MasteryLevel.EXPERT.value:
-            new_mastery = MasteryLevel.EXPERT
-        elif mastery_score >= 0.85:
-            new_mastery = MasteryLevel.PROFICIENT
-        elif mastery_score >= 0.7:
-            new_mastery = MasteryLevel.LEARNING
-        else:
-            new_mastery = MasteryLevel.NOVICE
+        new_mastery = _MASTERY_LEVELS[bisect.bisect_right(_MASTERY_THRESHOLDS, mastery_score)]
         
         # Only advance mastery, don't regress
-        if self._mastery_level_value(new_mastery) > self._mastery_level_value(current_mastery):
+        if new_mastery > current_mastery:
             player_progress.concept_mastery[concept] = new_mastery
     
     def recommend_review(self, player_progress: PlayerProgress) -> List[str]:
@@ -59,74 +107,61 @@ class ConceptTracker:
     
     def get_mastery_summary(self, player_progress: PlayerProgress) -> Dict[str, Any]:
         """Get a summary of the player's concept mastery"""
-        mastery_counts = {level.value: 0 for level in MasteryLevel}
+        mastery_counts = dict.fromkeys(_MASTERY_VALUE_KEYS, 0)
+        total_score = 0
+        strong_areas = []
+        areas_to_improve = []
         
-        for mastery in player_progress.concept_mastery.values():
-            mastery_counts[mastery.value] += 1
+        # Single pass over the mastery map builds every aggregate
+        for concept, mastery in player_progress.concept_mastery.items():
+            mastery_counts[_MASTERY_VALUE_KEYS[mastery]] += 1
+            total_score += mastery
+            if mastery >= MasteryLevel.PROFICIENT:
+                strong_areas.append(concept)
+            elif mastery is MasteryLevel.NOVICE:
+                areas_to_improve.append(concept)
         
         total_concepts = len(player_progress.concept_mastery)
+        max_possible_score = total_concepts * _MAX_MASTERY_VALUE
         
         return {
             "total_concepts": total_concepts,
             "mastery_breakdown": mastery_counts,
-            "overall_progress": self._calculate_overall_progress(player_progress),
-            "strong_areas": self._get_strong_concepts(player_progress),
-            "areas_to_improve": self._get_weak_concepts(player_progress)
+            "overall_progress": total_score / max_possible_score if max_possible_score > 0 else 0.0,
+            "strong_areas": strong_areas,
+            "areas_to_improve": areas_to_improve
         }
     
-    def _mastery_level_value(self, level: MasteryLevel) -> int:
-        """Convert mastery level to numeric value for comparison"""
-        level_values = {
-            MasteryLevel.NOVICE: 0,
-            MasteryLevel.LEARNING: 1,
-            MasteryLevel.PROFICIENT: 2,
-            MasteryLevel.EXPERT: 3
-        }
-        return level_values.get(level, 0)
-    
-    def _calculate_overall_progress(self, player_progress: PlayerProgress) -> float:
-        """Calculate overall learning progress (0.0 to 1.0)"""
-        if not player_progress.concept_mastery:
-            return 0.0
-        
-        total_score = sum(self._mastery_level_value(mastery) for mastery in player_progress.concept_mastery.values())
-        max_possible_score = len(player_progress.concept_mastery) * 3  # 3 = max mastery level
-        
-        return total_score / max_possible_score if max_possible_score > 0 else 0.0
-    
-    def _get_strong_concepts(self, player_progress: PlayerProgress) -> List[str]:
-        """Get concepts the player has mastered well"""
-        return [concept for concept, mastery in player_progress.concept_mastery.items() 
-                if mastery in [MasteryLevel.PROFICIENT, MasteryLevel.EXPERT]]
-    
-    def _get_weak_concepts(self, player_progress: PlayerProgress) -> List[str]:
-        """Get concepts that need more work"""
-        return [concept for concept, mastery in player_progress.concept_mastery.items()
-                if mastery == MasteryLevel.NOVICE]
-    
     def _sort_by_dependencies(self, concepts: List[str]) -> List[str]:
         """Sort concepts by their dependencies (prerequisites first)"""
-        # Simple topological sort based on dependencies
-        sorted_concepts = []
-        remaining = set(concepts)
+        unknown_rank = len(self._topo_index)
+        return sorted(concepts, key=lambda concept: self._topo_index.get(concept, unknown_rank))
+    
+    def _build_topological_index(self) -> Dict[str, int]:
+        """Rank every known concept so prerequisites come first (Kahn's algorithm)"""
+        all_concepts = set(self.concept_dependencies)
+        for deps in self.concept_dependencies.values():
+            all_concepts.update(deps)
         
-        while remaining:
-            # Find concepts with no remaining dependencies
-            ready = []
-            for concept in remaining:
-                deps = self.concept_dependencies.get(concept, [])
-                if not any(dep in remaining for dep in deps):
-                    ready.append(concept)
-            
-            if not ready:
-                # Break cycles by taking any remaining concept
-                ready.append(next(iter(remaining)))
-            
-            for concept in ready:
-                sorted_concepts.append(concept)
-                remaining.remove(concept)
+        pending = {concept: set(self.concept_dependencies.get(concept, [])) for concept in all_concepts}
+        dependents: Dict[str, List[str]] = {concept: [] for concept in all_concepts}
+        for concept, deps in pending.items():
+            for dep in deps:
+                dependents[dep].append(concept)
         
-        return sorted_concepts
+        ready = sorted(concept for concept, deps in pending.items() if not deps)
+        order: List[str] = []
+        while ready:
+            concept = ready.pop(0)
+            order.append(concept)
+            for dependent in sorted(dependents[concept]):
+                pending[dependent].discard(concept)
+                if not pending[dependent]:
+                    ready.append(dependent)
+        
+        # Concepts caught in a cycle keep a stable position after everything else
+        order.extend(sorted(all_concepts - set(order)))
+        return {concept: rank for rank, concept in enumerate(order)}
     
     def _load_concept_definitions(self) -> Dict[str, str]:
         """Load concept definitions and explanations"""
@@ -158,22 +193,36 @@ class ConceptTracker:
             "bias": ["neural_networks", "weights"]
         }
 
+def _new_player_record(max_actions: Optional[int] = None) -> Dict[str, Any]:
+    """Initial analytics record for a player seen for the first time"""
+    return {
+        "actions": deque(maxlen=max_actions),
+        "level_attempts": defaultdict(int),
+        "common_mistakes": [],
+        "learning_patterns": {},
+        "component_usage": Counter(),
+        # Running counters so insights don't rescan the action history
+        "quick_attempts": 0,
+        "total_actions": 0
+    }
+
 class LearningAnalytics:
     """Analyzes player learning patterns and provides insights"""
     
-    def __init__(self):
-        self.analytics_data = {}
+    def __init__(self, max_actions_per_player: int = 10_000, max_failures_per_level: int = 10_000):
+        # Only the most recent actions are kept per player, and the most recent failures
+        # per level; the running counters and level attempts still cover the full history
+        self.max_actions_per_player = max_actions_per_player
+        self.max_failures_per_level = max_failures_per_level
+        self.analytics_data: Dict[str, Dict[str, Any]] = defaultdict(
+            partial(_new_player_record, max_actions_per_player)
+        )
+        self._failed_by_level: Dict[int, deque] = defaultdict(partial(deque, maxlen=max_failures_per_level))
     
     def track_player_journey(self, player_id: str, action: str, level_id: int, 
                            build: Optional[ComponentBuild] = None, **kwargs):
         """Track a player action for analytics"""
-        if player_id not in self.analytics_data:
-            self.analytics_data[player_id] = {
-                "actions": [],
-                "level_attempts": {},
-                "common_mistakes": [],
-                "learning_patterns": {}
-            }
+        record = self.analytics_data[player_id]
         
         action_data = {
             "action": action,
@@ -185,64 +234,66 @@ class LearningAnalytics:
         if build:
             action_data["components_used"] = [comp.get("id", "") for comp in build.components]
             action_data["component_count"] = len(build.components)
+            record["component_usage"].update(action_data["components_used"])
         
-        self.analytics_data[player_id]["actions"].append(action_data)
+        record["actions"].append(action_data)
+        record["total_actions"] += 1
+        if kwargs.get("time_spent", 0) < 30:  # Less than 30 seconds
+            record["quick_attempts"] += 1
+        
+        # Index failures by level so mistake analysis doesn't rescan every action
+        if action == "failed_attempt":
+            self._failed_by_level[level_id].append({
+                "level_id": level_id,
+                "error_type": action_data.get("error_type", "unknown"),
+                "components_used": action_data.get("components_used", []),
+                "component_count": action_data.get("component_count", 0)
+            })
         
         # Track level attempts
-        if level_id not in self.analytics_data[player_id]["level_attempts"]:
-            self.analytics_data[player_id]["level_attempts"][level_id] = 0
-        self.analytics_data[player_id]["level_attempts"][level_id] += 1
+        record["level_attempts"][level_id] += 1
     
     def analyze_common_mistakes(self, level_id: int) -> List[Dict[str, Any]]:
-        """Analyze common mistakes across all players for a level"""
-        mistakes = []
-        
-        for player_data in self.analytics_data.values():
-            for action in player_data["actions"]:
-                if action["level_id"] == level_id and action["action"] == "failed_attempt":
-                    mistake = {
-                        "level_id": level_id,
-                        "error_type": action.get("error_type", "unknown"),
-                        "components_used": action.get("components_used", []),
-                        "component_count": action.get("component_count", 0)
-                    }
-                    mistakes.append(mistake)
-        
+        """Analyze common mistakes across all players for a level (over its most recent failures)"""
         # Group and count similar mistakes
-        mistake_patterns = {}
-        for mistake in mistakes:
-            pattern_key = f"{mistake['error_type']}_{mistake['component_count']}"
-            if pattern_key not in mistake_patterns:
-                mistake_patterns[pattern_key] = {"count": 0, "details": mistake}
-            mistake_patterns[pattern_key]["count"] += 1
+        pattern_counts = Counter()
+        pattern_details = {}
+        for mistake in self._failed_by_level.get(level_id, ()):
+            pattern_key = (mistake["error_type"], mistake["component_count"])
+            pattern_counts[pattern_key] += 1
+            pattern_details.setdefault(pattern_key, mistake)
         
-        return sorted(mistake_patterns.values(), key=lambda x: x["count"], reverse=True)
+        return [
+            {"count": count, "details": pattern_details[pattern_key]}
+            for pattern_key, count in pattern_counts.most_common()
+        ]
     
     def generate_difficulty_report(self) -> Dict[str, Any]:
         """Generate a report on level difficulty based on player data"""
-        level_stats = {}
-        
+        # Stream (level, attempts) pairs straight into typed buffers for the aggregation kernel
+        level_positions: Dict[int, int] = {}
+        level_index = array("i")
+        attempt_values = array("d")
         for player_data in self.analytics_data.values():
             for level_id, attempts in player_data["level_attempts"].items():
-                if level_id not in level_stats:
-                    level_stats[level_id] = {
-                        "total_attempts": 0,
-                        "total_players": 0,
-                        "completion_rates": []
-                    }
-                
-                level_stats[level_id]["total_attempts"] += attempts
-                level_stats[level_id]["total_players"] += 1
-                
-                # Estimate completion based on attempts (simplified)
-                completion_rate = 1.0 / attempts if attempts > 0 else 0
-                level_stats[level_id]["completion_rates"].append(completion_rate)
+                level_index.append(level_positions.setdefault(level_id, len(level_positions)))
+                attempt_values.append(attempts)
+        
+        if not level_positions:
+            return {}
+        
+        total_attempts, total_players, completion_sum = _aggregate_level_attempts(
+            np.frombuffer(level_index, dtype=np.intc),
+            np.frombuffer(attempt_values, dtype=np.float64),
+            len(level_positions)
+        )
         
         # Calculate difficulty metrics
         difficulty_report = {}
-        for level_id, stats in level_stats.items():
-            avg_attempts = stats["total_attempts"] / stats["total_players"] if stats["total_players"] > 0 else 0
-            avg_completion_rate = sum(stats["completion_rates"]) / len(stats["completion_rates"]) if stats["completion_rates"] else 0
+        for level_id, position in level_positions.items():
+            players = total_players[position]
+            avg_attempts = float(total_attempts[position] / players) if players > 0 else 0
+            avg_completion_rate = float(completion_sum[position] / players) if players > 0 else 0
             
             difficulty_score = avg_attempts * (1 - avg_completion_rate)  # Higher = more difficult
             
@@ -260,7 +311,7 @@ class LearningAnalytics:
                 "avg_attempts": avg_attempts,
                 "avg_completion_rate": avg_completion_rate,
                 "difficulty_score": difficulty_score,
-                "total_players": stats["total_players"]
+                "total_players": int(players)
             }
         
         return difficulty_report
@@ -282,45 +333,98 @@ class LearningAnalytics:
         else:
             learning_velocity = 0
         
-        # Analyze preferred components
-        component_usage = {}
-        for action in player_data["actions"]:
-            for component in action.get("components_used", []):
-                component_usage[component] = component_usage.get(component, 0) + 1
+        # Preferred components (usage is counted incrementally as actions are tracked)
+        preferred_components = player_data["component_usage"].most_common(5)
         
-        preferred_components = sorted(component_usage.items(), key=lambda x: x[1], reverse=True)[:5]
+        # Every tracked action counts as one level attempt, so the totals coincide
+        total_actions = player_data["total_actions"]
+        levels_attempted = len(player_data["level_attempts"])
         
         return {
             "learning_velocity": learning_velocity,
-            "total_actions": len(player_data["actions"]),
-            "levels_attempted": len(player_data["level_attempts"]),
-            "avg_attempts_per_level": sum(player_data["level_attempts"].values()) / len(player_data["level_attempts"]) if player_data["level_attempts"] else 0,
+            "total_actions": total_actions,
+            "levels_attempted": levels_attempted,
+            "avg_attempts_per_level": total_actions / levels_attempted if levels_attempted else 0,
             "preferred_components": preferred_components,
             "learning_style": self._infer_learning_style(player_data)
         }
     
     def _infer_learning_style(self, player_data: Dict) -> str:
         """Infer player's learning style from their behavior"""
-        total_actions = len(player_data["actions"])
+        total_actions = player_data["total_actions"]
         if total_actions == 0:
             return "unknown"
         
-        # Count different types of actions
-        quick_attempts = sum(1 for action in player_data["actions"] 
-                           if action.get("time_spent", 0) < 30)  # Less than 30 seconds
-        
-        if quick_attempts / total_actions > 0.7:
+        if player_data["quick_attempts"] / total_actions > 0.7:
             return "trial_and_error"  # Prefers trying quickly
-        elif sum(player_data["level_attempts"].values()) / len(player_data["level_attempts"]) > 3:
+        elif total_actions / len(player_data["level_attempts"]) > 3:
             return "methodical"  # Takes time, multiple careful attempts
         else:
             return "balanced"  # Mix of both approaches
     
     def _get_timestamp(self) -> int:
-        """Get current timestamp"""
-        import time
-        return int(time.time())
+        """Get current timestamp (monotonic seconds, used for time spans)"""
+        return int(_now())
+
+class PlayerProgressStore:
+    """In-process store of player progress, shared between requests.
+    
+    Memory-only: nothing is persisted, so progress lasts as long as the process.
+    Players who were looked up but never recorded anything are bounded by an LRU of
+    ``max_players``. Records that hold progress are never evicted - the store has
+    no other copy - so that map is unbounded by design and grows with every player
+    who completes a level.
+    """
+    
+    def __init__(self, max_players: int = 10_000):
+        self.max_players = max_players
+        self._players: "OrderedDict[str, PlayerProgress]" = OrderedDict()  # No progress yet
+        self._retained: Dict[str, PlayerProgress] = {}  # Holds progress - never evicted
+        # Per-player record locks with their holder/waiter counts, kept only while in use
+        self._record_locks: Dict[str, List[Any]] = {}
+        # Guards the maps above (never held while a record is in use)
+        self._lock = threading.Lock()
+    
+    def get_or_create(self, player_id: str) -> PlayerProgress:
+        """Get a player's progress, creating a fresh record on first sight"""
+        with self._lock:
+            player_progress = self._retained.get(player_id)
+            if player_progress is not None:
+                return player_progress
+            player_progress = self._players.get(player_id)
+            if player_progress is None:
+                player_progress = PlayerProgress(player_id=player_id)
+                self._players[player_id] = player_progress
+                if len(self._players) > self.max_players:
+                    self._players.popitem(last=False)
+            else:
+                self._players.move_to_end(player_id)
+            return player_progress
+    
+    @contextmanager
+    def locked(self, player_id: str) -> Iterator[PlayerProgress]:
+        """Hold a player's record exclusively while it is read or updated"""
+        with self._lock:
+            entry = self._record_locks.get(player_id)
+            if entry is None:
+                entry = self._record_locks[player_id] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                player_progress = self.get_or_create(player_id)
+                yield player_progress
+                if player_progress.completed_levels:
+                    with self._lock:
+                        # Progress exists only here, so the record must outlive the LRU
+                        self._players.pop(player_id, None)
+                        self._retained[player_id] = player_progress
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._record_locks[player_id]
 
 # Global instances
 concept_tracker = ConceptTracker()
-learning_analytics = LearningAnalytics()
\ No newline at end of file
+learning_analytics = LearningAnalytics()
+player_store = PlayerProgressStore()
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Simulation Micro-Batching
+Coalesces concurrent simulate-build requests into batched engine calls.
+"""
+from typing import List, Optional, Set, Tuple
+import asyncio
+from fastapi.concurrency import run_in_threadpool
+from models.game_models import ComponentBuild, SimulationResult
+from core.engine.simulation import simulation_engine, TensorForgeSimulationEngine
+
+class SimulationBatcher:
+    """Queues simulation requests and drains them in small batches.
+
+    Mirrors the usual model-server knobs: a batch is dispatched once
+    ``max_batch_size`` requests are waiting or ``max_batch_time`` seconds
+    have passed since the first one arrived.
+    """
+
+    def __init__(self, engine: TensorForgeSimulationEngine, max_batch_size: int = 32, max_batch_time: float = 0.005):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self):
+        """Start the background drainer (call from the app's startup hook)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._drain())
+
+    async def stop(self):
+        """Stop the background drainer, finishing dispatched batches and failing queued requests"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        if self._queue is not None:
+            queued = []
+            while not self._queue.empty():
+                queued.append(self._queue.get_nowait())
+            self._fail(queued)
+        self._worker = None
+        self._queue = None
+
+    @staticmethod
+    def _fail(batch: List[Tuple[ComponentBuild, int, asyncio.Future]]):
+        """Fail requests that will never be executed because the batcher is stopping"""
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Simulation batcher stopped"))
+
+    async def submit(self, build: ComponentBuild, level_id: int) -> SimulationResult:
+        """Simulate a build, batching it with any concurrent requests"""
+        if not self.running:
+            # No drainer (e.g. router mounted without the startup hook) - run directly
+            return await run_in_threadpool(self.engine.simulate_build, build, level_id)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((build, level_id, future))
+        return await future
+
+    async def _drain(self):
+        """Collect queued requests into batches and execute them off the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[ComponentBuild, int, asyncio.Future]] = [await self._queue.get()]
+            deadline = loop.time() + self.max_batch_time
+
+            try:
+                while len(batch) < self.max_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Stopped mid-collection - don't leave the requests already taken hanging
+                self._fail(batch)
+                raise
+
+            # Dispatch without waiting so the next batch is collected while this one runs
+            task = asyncio.create_task(self._run_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _run_batch(self, batch: List[Tuple[ComponentBuild, int, asyncio.Future]]):
+        """Execute one batch on the threadpool and resolve its futures"""
+        builds = [item[0] for item in batch]
+        level_ids = [item[1] for item in batch]
+        try:
+            results = await run_in_threadpool(self.engine.simulate_builds_batch, builds, level_ids)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+# Global simulation batcher instance
+simulation_batcher = SimulationBatcher(simulation_engine)
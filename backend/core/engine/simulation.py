@@ -2,13 +2,16 @@
 Enhanced Simulation Engine
 Provides computation graph execution and educational simulations.
 """
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Callable, NamedTuple, Sequence
 import torch
 import torch.nn as nn
 import numpy as np
+import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from models.game_models import ComponentBuild, SimulationResult, ValidationResult, ValidationIssue
-from core.components.registry import component_registry
+from core.components.registry import component_registry, multiply_add
 
 @dataclass
 class ComponentNode:
@@ -18,6 +21,7 @@ class ComponentNode:
     inputs: List[str] = None
     outputs: List[str] = None
     parameters: Dict[str, Any] = None
+    implementation: Optional[Callable] = None  # Resolved from the registry when added to a graph
     
     def __post_init__(self):
         if self.inputs is None:
@@ -27,6 +31,83 @@ class ComponentNode:
         if self.parameters is None:
             self.parameters = {}
 
+class _NormalizedComponent(NamedTuple):
+    """A build component reduced to the fields the engine reads"""
+    id: str
+    lowered_id: str
+    type: str
+    parameters: Dict[str, Any]
+
+def _normalize_components(components: Sequence[Any]) -> Tuple[_NormalizedComponent, ...]:
+    """Resolve dict/object components once so the engine's helpers don't re-branch per field"""
+    normalized = []
+    for comp in components:
+        if isinstance(comp, dict):
+            comp_id = comp.get("id", comp.get("name", ""))
+            comp_type = comp.get("type", "")
+            parameters = comp.get("parameters")
+        else:
+            comp_id = getattr(comp, 'id', "")
+            comp_type = getattr(comp, 'type', "")
+            parameters = getattr(comp, 'parameters', None)
+        comp_id = comp_id or ""
+        normalized.append(_NormalizedComponent(comp_id, comp_id.lower(), comp_type, parameters or {}))
+    return tuple(normalized)
+
+def _is_stochastic(components: Tuple[_NormalizedComponent, ...]) -> bool:
+    """Whether a build's output varies between runs (dropout is only active with training=True)"""
+    return any(component.id == "dropout" and isinstance(component.parameters, dict)
+               and component.parameters.get("training", False) for component in components)
+
+class _ComponentModule(nn.Module):
+    """A resolved component implementation, with its parameters bound, as an nn.Module"""
+    
+    def __init__(self, implementation: Callable, parameters: Dict[str, Any]):
+        super().__init__()
+        self.implementation = implementation
+        self.parameters_ = parameters
+    
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return self.implementation(x, **self.parameters_)
+
+# Opt-in: let torch.compile fuse the pointwise chains (first call per topology pays the compile cost)
+_USE_TORCH_COMPILE = os.environ.get("TF_TORCH_COMPILE") == "1" and hasattr(torch, "compile")
+
+# Opt-in: run graphs as frozen TorchScript under the NNC fuser (TorchScript no longer supports nvFuser)
+_USE_TORCHSCRIPT = os.environ.get("TF_TORCHSCRIPT") == "1"
+_JIT_FUSER = "fuser1"
+
+# Opt-in: pin intra-/inter-op thread counts (TF_TORCH_THREADS=1 suits tiny graphs, where the
+# threadpool and batcher provide the parallelism and OpenMP fork-join costs more than the GEMM)
+_TORCH_THREADS = os.environ.get("TF_TORCH_THREADS")
+if _TORCH_THREADS:
+    torch.set_num_threads(int(_TORCH_THREADS))
+    try:
+        torch.set_num_interop_threads(int(_TORCH_THREADS))
+    except RuntimeError:
+        # Only settable before any inter-op work has started
+        pass
+
+# Fixed per-level simulation inputs, allocated once. Component implementations never
+# modify their input in place, so these are handed out directly.
+_LEVEL_INPUTS: Dict[int, torch.Tensor] = {
+    2: torch.tensor([1.0, 2.0, 3.0, 4.0]),
+    3: torch.tensor([0.5, 1.5, 2.5])
+}
+_DEFAULT_INPUT = torch.tensor([1.0, 0.5, 0.8, 0.3])
+
+# Component ids (lowercase) each level's build must include
+_REQUIRED_BY_LEVEL: Dict[int, Tuple[str, ...]] = {
+    1: ("neural_layer",),
+    2: ("neural_layer", "activation"),
+    3: ("neural_layer", "tensor_add", "tensor_multiply"),
+    4: ("neural_layer", "activation", "dense_layer")
+}
+
+# Id keywords that earn a bonus in Level 2 and Mini-Boss 1 scoring
+_LEVEL_2_TOKENS = ("neural", "activation")
+_MINI_BOSS_1_TOKENS = ("dropout", "dense")
+
 class ComputationGraph:
     """Executes a sequence of AI components"""
     
@@ -34,70 +115,234 @@ class ComputationGraph:
         self.nodes: List[ComponentNode] = []
         self.execution_order: List[str] = []
         self.intermediate_results: Dict[str, torch.Tensor] = {}
+        self.final_output: Optional[torch.Tensor] = None
+        self._nodes_by_id: Dict[str, ComponentNode] = {}
     
     def add_component(self, component_id: str, node_id: str, parameters: Dict[str, Any] = None) -> str:
         """Add a component to the computation graph"""
+        implementation = component_registry.get_implementation(component_id)
+        if not implementation:
+            raise ValueError(f"No implementation found for component: {component_id}")
+        
         node = ComponentNode(
             id=node_id,
             component_id=component_id,
-            parameters=parameters or {}
+            parameters=parameters or {},
+            implementation=implementation
         )
         self.nodes.append(node)
+        self._nodes_by_id[node_id] = node
         self.execution_order.append(node_id)
         return node_id
     
-    def execute(self, input_data: torch.Tensor) -> Dict[str, torch.Tensor]:
-        """Execute the computation graph"""
+    def optimize(self) -> int:
+        """Rewrite the execution order for inference; returns how many nodes were removed.
+        
+        Dropout is the identity unless ``training=True`` is passed, a ReLU directly
+        after another ReLU changes nothing (relu is idempotent), and a tensor_multiply
+        feeding a tensor_add collapses into one fused multiply-add.
+        """
+        optimized_order = []
+        previous_node = None
+        for node_id in self.execution_order:
+            node = self._nodes_by_id.get(node_id)
+            if node is None:
+                continue
+            params = node.parameters if isinstance(node.parameters, dict) else {}
+            previous_component = previous_node.component_id if previous_node else None
+            if node.component_id == "dropout" and not params.get("training", False):
+                continue
+            if node.component_id == "activation_relu" and previous_component == "activation_relu":
+                continue
+            if node.component_id == "tensor_add" and previous_component == "tensor_multiply":
+                fused = self._fuse_multiply_add(previous_node, node)
+                if fused is not None:
+                    optimized_order[-1] = fused.id
+                    previous_node = fused
+                    continue
+            optimized_order.append(node_id)
+            previous_node = node
+        
+        removed = len(self.execution_order) - len(optimized_order)
+        self.execution_order = optimized_order
+        return removed
+    
+    def _fuse_multiply_add(self, multiply_node: ComponentNode, add_node: ComponentNode) -> Optional[ComponentNode]:
+        """Replace a tensor_multiply -> tensor_add pair with a single fused node, if the operands allow"""
+        multiply_params = multiply_node.parameters if isinstance(multiply_node.parameters, dict) else {}
+        add_params = add_node.parameters if isinstance(add_node.parameters, dict) else {}
+        multiplier = multiply_params.get("multiplier", 2.0)
+        
+        # Only the plain scalar/tensor operand forms are fused; anything else runs unfused
+        if set(multiply_params) - {"multiplier"} or set(add_params) - {"constant"}:
+            return None
+        if isinstance(multiplier, bool) or not isinstance(multiplier, (int, float, torch.Tensor)):
+            return None
+        if "constant" in add_params and not isinstance(add_params["constant"], torch.Tensor):
+            return None
+        
+        fused = ComponentNode(
+            id=add_node.id,
+            component_id="tensor_multiply+tensor_add",
+            parameters={**multiply_params, **add_params},
+            implementation=multiply_add
+        )
+        self._nodes_by_id[fused.id] = fused
+        return fused
+    
+    def compile(self) -> nn.Module:
+        """Fold the graph into a single module that runs every component in order"""
+        self.optimize()
+        modules = []
+        for node_id in self.execution_order:
+            node = self._nodes_by_id.get(node_id)
+            if node:
+                params = node.parameters if isinstance(node.parameters, dict) else {}
+                modules.append(_ComponentModule(node.implementation, params))
+        
+        module = nn.Sequential(*modules).eval()
+        if _USE_TORCH_COMPILE:
+            module = torch.compile(module, mode="reduce-overhead")
+        return module
+    
+    def to_script(self, example_input: torch.Tensor) -> torch.jit.ScriptModule:
+        """Trace the compiled graph into a frozen TorchScript module.
+        
+        Implementations take ``**kwargs`` and read shapes in Python, so the graph is
+        traced (specialised to the example's feature size) rather than scripted.
+        """
+        with torch.no_grad():
+            traced = torch.jit.trace(self.compile(), example_input, check_trace=False)
+        return torch.jit.freeze(traced.eval())
+    
+    @torch.inference_mode()
+    def execute(self, input_data: torch.Tensor, compiled: Optional[nn.Module] = None,
+                keep_intermediates: bool = False) -> Dict[str, torch.Tensor]:
+        """Execute the computation graph.
+        
+        Only the input and final output are returned unless ``keep_intermediates``
+        is set; ``compiled`` (from ``compile()``) is used when intermediates aren't needed.
+        """
+        if compiled is not None and self.execution_order and not keep_intermediates:
+            try:
+                if isinstance(compiled, torch.jit.ScriptModule):
+                    with torch.jit.fuser(_JIT_FUSER):
+                        self.final_output = compiled(input_data)
+                else:
+                    self.final_output = compiled(input_data)
+                self.intermediate_results = {
+                    "input": input_data,
+                    self.execution_order[-1]: self.final_output
+                }
+                return self.intermediate_results
+            except Exception:
+                # Re-run eagerly so the error names the failing component
+                pass
+        
         self.intermediate_results = {"input": input_data}
         current_data = input_data
+        last_node_id = None
         
+        nodes_by_id = self._nodes_by_id
         for node_id in self.execution_order:
-            node = self._get_node(node_id)
+            node = nodes_by_id.get(node_id)
             if not node:
                 continue
             
-            # Get component implementation
-            implementation = component_registry.get_implementation(node.component_id)
-            if not implementation:
-                raise ValueError(f"No implementation found for component: {node.component_id}")
-            
             # Execute component
             try:
                 # Ensure parameters is a proper dict
                 params = node.parameters if isinstance(node.parameters, dict) else {}
-                current_data = implementation(current_data, **params)
-                self.intermediate_results[node_id] = current_data
+                current_data = node.implementation(current_data, **params)
+                if keep_intermediates:
+                    self.intermediate_results[node_id] = current_data
+                last_node_id = node_id
             except Exception as e:
                 raise RuntimeError(f"Error executing component {node.component_id}: {str(e)}")
         
+        self.final_output = current_data
+        if last_node_id is not None and not keep_intermediates:
+            self.intermediate_results[last_node_id] = current_data
         return self.intermediate_results
     
+    def execute_batch(self, inputs: List[torch.Tensor], compiled: Optional[nn.Module] = None) -> Dict[str, torch.Tensor]:
+        """Execute the graph once over several inputs stacked along a leading batch dimension.
+        
+        Every registered component operates on the last dimension, so they broadcast
+        over the batch as-is. Identical inputs are expanded as a view rather than copied.
+        """
+        first = inputs[0]
+        if all(item is first for item in inputs):
+            batch_input = first.unsqueeze(0).expand(len(inputs), *first.shape)
+        else:
+            batch_input = torch.stack(inputs, dim=0)
+        return self.execute(batch_input, compiled)
+    
     def _get_node(self, node_id: str) -> Optional[ComponentNode]:
         """Get node by ID"""
-        for node in self.nodes:
-            if node.id == node_id:
-                return node
-        return None
+        return self._nodes_by_id.get(node_id)
     
     def clear(self):
         """Clear the computation graph"""
         self.nodes = []
         self.execution_order = []
         self.intermediate_results = {}
+        self.final_output = None
+        self._nodes_by_id = {}
 
 class TensorForgeSimulationEngine:
     """Enhanced simulation engine for educational AI"""
     
-    def __init__(self):
+    def __init__(self, max_compiled_graphs: int = 128, max_cached_validations: int = 128):
+        # Kept for existing callers only; simulations build their own graph and never touch it
         self.computation_graph = ComputationGraph()
         self.validation_rules = self._load_validation_rules()
+        
+        # Validation is pure over (level, components), so replays of a build reuse the result
+        self.max_cached_validations = max_cached_validations
+        self._validation_cache: "OrderedDict[Tuple, ValidationResult]" = OrderedDict()
+        self._validation_lock = threading.Lock()
+        
+        # Compiled graph modules keyed by component topology, reused across simulations
+        self.max_compiled_graphs = max_compiled_graphs
+        self._compiled_graphs: "OrderedDict[Tuple, nn.Module]" = OrderedDict()
+        self._compiled_lock = threading.Lock()
+        component_registry.add_change_listener(self.clear_compiled_graphs)
     
-    def validate_build(self, build: ComponentBuild, level_id: int) -> ValidationResult:
-        """Validate a component build for correctness"""
+    def validate_build(self, build: ComponentBuild, level_id: int,
+                       components: Optional[Tuple[_NormalizedComponent, ...]] = None) -> ValidationResult:
+        """Validate a component build for correctness (memoized by build fingerprint)"""
+        if components is None:
+            components = _normalize_components(build.components)
+        key = self._validation_key(components, level_id)
+        try:
+            hash(key)
+        except TypeError:
+            # Client-sent ids/types can be lists or dicts - validate those without the memo
+            return self._validate_build_uncached(components, level_id)
+        with self._validation_lock:
+            cached = self._validation_cache.get(key)
+            if cached is not None:
+                self._validation_cache.move_to_end(key)
+                return cached
+        
+        result = self._validate_build_uncached(components, level_id)
+        with self._validation_lock:
+            self._validation_cache[key] = result
+            while len(self._validation_cache) > self.max_cached_validations:
+                self._validation_cache.popitem(last=False)
+        return result
+    
+    def _validation_key(self, components: Tuple[_NormalizedComponent, ...], level_id: int) -> Tuple:
+        """Fingerprint of everything validation looks at (unhashable if a client sent non-scalar fields)"""
+        return (level_id, tuple((comp.id, comp.type) for comp in components))
+    
+    def _validate_build_uncached(self, components: Tuple[_NormalizedComponent, ...], level_id: int) -> ValidationResult:
+        """Run every validation check on a build"""
         issues = []
         
         # Check minimum component requirements
-        if len(build.components) == 0:
+        if len(components) == 0:
             issues.append(ValidationIssue(
                 type="missing_components",
                 component_id=None,
@@ -109,17 +354,13 @@ class TensorForgeSimulationEngine:
         
         # Check for required component types based on level
         required_components = self._get_required_components(level_id)
-        component_ids = []
-        
-        for comp in build.components:
-            if isinstance(comp, dict):
-                comp_id = comp.get("id", comp.get("name", ""))
-            else:
-                comp_id = getattr(comp, 'id', "")
-            component_ids.append(comp_id.lower())
+        component_ids = [comp.lowered_id for comp in components]
         
+        # Every error is raised here; the checks below only add warnings
+        has_error = False
         for required in required_components:
-            if not any(required.lower() in comp_id for comp_id in component_ids):
+            if not any(required in comp_id for comp_id in component_ids):
+                has_error = True
                 issues.append(ValidationIssue(
                     type="missing_required_component",
                     component_id=required,
@@ -129,129 +370,252 @@ class TensorForgeSimulationEngine:
                 ))
         
         # Check component order and compatibility
-        self._validate_component_sequence(build.components, issues)
+        self._validate_component_sequence(components, issues)
         
-        # Level-specific validation
-        self._validate_level_specific_requirements(build, level_id, issues)
+        # Level-specific validation is advisory, so skip it once the build has failed anyway
+        if not has_error:
+            self._validate_level_specific_requirements(components, level_id, issues)
         
-        is_valid = not any(issue.severity == "error" for issue in issues)
         suggestions = [issue.hint for issue in issues if issue.hint and issue.severity != "error"]
         
-        return ValidationResult(is_valid, issues, suggestions)
+        return ValidationResult(not has_error, issues, suggestions)
     
-    def simulate_build(self, build: ComponentBuild, level_id: int, input_data: Optional[torch.Tensor] = None) -> SimulationResult:
+    def simulate_build(self, build: ComponentBuild, level_id: int, input_data: Optional[torch.Tensor] = None,
+                       keep_intermediates: bool = False) -> SimulationResult:
         """Simulate a component build and return results"""
         
+        components = _normalize_components(build.components)
+        
         # First validate the build
-        validation_result = self.validate_build(build, level_id)
+        validation_result = self.validate_build(build, level_id, components)
         if not validation_result.is_valid:
-            error_messages = [issue.message for issue in validation_result.issues if issue.severity == "error"]
-            return SimulationResult(
-                success=False,
-                score=0.0,
-                message="; ".join(error_messages),
-                validation_result=validation_result
-            )
+            return self._invalid_build_result(validation_result)
         
         try:
-            # Clear previous computation graph
-            self.computation_graph.clear()
-            
-            # Build computation graph from components
-            for i, component in enumerate(build.components):
-                # Handle component as dict or object
-                if isinstance(component, dict):
-                    comp_id = component.get("id", component.get("name", f"component_{i}"))
-                    parameters = component.get("parameters", {})
-                else:
-                    comp_id = getattr(component, 'id', f"component_{i}")
-                    parameters = getattr(component, 'parameters', {})
-                
-                node_id = f"node_{i}"
-                self.computation_graph.add_component(comp_id, node_id, parameters)
+            # Use a per-call graph so concurrent simulations (threadpool) don't share state
+            graph = self._build_graph(components)
             
             # Generate or use provided input data
             if input_data is None:
                 input_data = self._generate_input_data(level_id)
             
             # Execute the computation graph
-            results = self.computation_graph.execute(input_data)
+            if keep_intermediates:
+                results = graph.execute(input_data, keep_intermediates=True)
+            else:
+                results = graph.execute(input_data, self._compiled_graph(components, graph, input_data))
             
-            # Evaluate results based on level criteria
-            success, score, message, visual_data = self._evaluate_results(results, level_id, build)
+            return self._build_result(build, components, level_id, results, validation_result)
             
-            # Generate educational feedback
-            educational_feedback = self._generate_educational_feedback(build, results, level_id)
+        except Exception as e:
+            return self._failed_simulation_result(e, validation_result)
+    
+    def simulate_builds_batch(self, builds: List[ComponentBuild], level_ids: List[int]) -> List[SimulationResult]:
+        """Simulate several builds, sharing one forward pass per identical topology.
+        
+        Builds with the same level and component sequence get the same input and so
+        the same output: the graph runs once and every member is scored on it. Only
+        stochastic graphs (dropout with ``training=True``) are stacked along a leading
+        batch dimension so each member draws its own mask. A malformed build fails on
+        its own without affecting the rest of the batch.
+        """
+        results: List[Optional[SimulationResult]] = [None] * len(builds)
+        normalized: List[Optional[Tuple[_NormalizedComponent, ...]]] = [None] * len(builds)
+        groups: Dict[Tuple, List[Tuple[int, ValidationResult]]] = {}
+        
+        for index, (build, level_id) in enumerate(zip(builds, level_ids)):
+            try:
+                normalized[index] = _normalize_components(build.components)
+                validation_result = self.validate_build(build, level_id, normalized[index])
+                if not validation_result.is_valid:
+                    results[index] = self._invalid_build_result(validation_result)
+                    continue
+                key = self._topology_key(normalized[index], level_id)
+            except Exception as e:
+                results[index] = self._failed_simulation_result(e, None)
+                continue
+            groups.setdefault(key, []).append((index, validation_result))
+        
+        for (level_id, _), members in groups.items():
+            # All members share a topology, so the first build defines the graph
+            components = normalized[members[0][0]]
+            if len(members) > 1 and _is_stochastic(components):
+                self._simulate_stacked(builds, normalized, level_id, members, results)
+                continue
             
-            return SimulationResult(
-                success=success,
-                score=score,
-                message=message,
-                visual_data=visual_data,
-                validation_result=validation_result,
-                educational_feedback=educational_feedback
-            )
+            try:
+                graph = self._build_graph(components)
+                input_data = self._generate_input_data(level_id)
+                shared_results = graph.execute(input_data, self._compiled_graph(components, graph, input_data))
+            except Exception as e:
+                for index, validation_result in members:
+                    results[index] = self._failed_simulation_result(e, validation_result)
+                continue
             
+            for index, validation_result in members:
+                try:
+                    results[index] = self._build_result(builds[index], normalized[index], level_id,
+                                                        shared_results, validation_result)
+                except Exception as e:
+                    results[index] = self._failed_simulation_result(e, validation_result)
+        
+        return results
+    
+    def _simulate_stacked(self, builds: List[ComponentBuild], normalized: List[Tuple[_NormalizedComponent, ...]],
+                          level_id: int, members: List[Tuple[int, ValidationResult]],
+                          results: List[Optional[SimulationResult]]):
+        """Run a stochastic group as one batched forward pass, one row per member"""
+        try:
+            components = normalized[members[0][0]]
+            graph = self._build_graph(components)
+            single_input = self._generate_input_data(level_id)
+            inputs = [single_input] * len(members)
+            batch_results = graph.execute_batch(inputs, self._compiled_graph(components, graph, single_input))
+            
+            for row, (index, validation_result) in enumerate(members):
+                row_results = {key: value[row] for key, value in batch_results.items()}
+                results[index] = self._build_result(builds[index], normalized[index], level_id, row_results, validation_result)
+        except Exception:
+            # Fall back to isolated execution so one bad shape can't fail the whole group
+            for index, validation_result in members:
+                results[index] = self._simulate_single(builds[index], normalized[index], level_id, validation_result)
+    
+    def _simulate_single(self, build: ComponentBuild, components: Tuple[_NormalizedComponent, ...],
+                         level_id: int, validation_result: ValidationResult) -> SimulationResult:
+        """Execute an already-validated build on its own"""
+        try:
+            graph = self._build_graph(components)
+            input_data = self._generate_input_data(level_id)
+            results = graph.execute(input_data, self._compiled_graph(components, graph, input_data))
+            return self._build_result(build, components, level_id, results, validation_result)
         except Exception as e:
-            return SimulationResult(
-                success=False,
-                score=0.0,
-                message=f"Simulation failed: {str(e)}",
-                validation_result=validation_result
-            )
+            return self._failed_simulation_result(e, validation_result)
+    
+    def _build_graph(self, components: Tuple[_NormalizedComponent, ...]) -> ComputationGraph:
+        """Build a computation graph from the build's components"""
+        graph = ComputationGraph()
+        for i, component in enumerate(components):
+            node_id = f"node_{i}"
+            graph.add_component(component.id or f"component_{i}", node_id, component.parameters)
+        return graph
+    
+    def clear_compiled_graphs(self):
+        """Drop compiled graphs (they hold registry implementations)"""
+        with self._compiled_lock:
+            self._compiled_graphs.clear()
+    
+    def _compiled_graph(self, components: Tuple[_NormalizedComponent, ...], graph: ComputationGraph,
+                        example_input: torch.Tensor) -> nn.Module:
+        """Get the compiled module for a build's topology, compiling it on first use"""
+        # Compilation doesn't depend on the level, only on components and parameters
+        _, key = self._topology_key(components, 0)
+        if _USE_TORCHSCRIPT:
+            # Traced graphs are specialised to the feature size (leading batch dims are fine)
+            key = (key, example_input.shape[-1])
+        with self._compiled_lock:
+            module = self._compiled_graphs.get(key)
+            if module is not None:
+                self._compiled_graphs.move_to_end(key)
+                return module
+        
+        module = None
+        if _USE_TORCHSCRIPT:
+            try:
+                module = graph.to_script(example_input)
+            except Exception:
+                module = None  # Not traceable - use the eager Sequential instead
+        if module is None:
+            module = graph.compile()
+        with self._compiled_lock:
+            self._compiled_graphs[key] = module
+            while len(self._compiled_graphs) > self.max_compiled_graphs:
+                self._compiled_graphs.popitem(last=False)
+        return module
+    
+    def _topology_key(self, components: Tuple[_NormalizedComponent, ...], level_id: int) -> Tuple:
+        """Hashable key identifying builds that can share one batched forward pass"""
+        return (level_id, tuple(
+            (component.id or f"component_{i}", repr(sorted(component.parameters.items())))
+            for i, component in enumerate(components)
+        ))
+    
+    def _build_result(self, build: ComponentBuild, components: Tuple[_NormalizedComponent, ...], level_id: int,
+                      results: Dict[str, torch.Tensor], validation_result: ValidationResult) -> SimulationResult:
+        """Turn raw graph outputs into a scored SimulationResult"""
+        # Evaluate results based on level criteria
+        success, score, message, visual_data = self._evaluate_results(results, level_id, components)
+        
+        # Generate educational feedback
+        educational_feedback = self._generate_educational_feedback(build, results, level_id)
+        
+        return SimulationResult(
+            success=success,
+            score=score,
+            message=message,
+            visual_data=visual_data,
+            validation_result=validation_result,
+            educational_feedback=educational_feedback
+        )
+    
+    def _invalid_build_result(self, validation_result: ValidationResult) -> SimulationResult:
+        """Result for a build that failed validation"""
+        error_messages = [issue.message for issue in validation_result.issues if issue.severity == "error"]
+        return SimulationResult(
+            success=False,
+            score=0.0,
+            message="; ".join(error_messages),
+            validation_result=validation_result
+        )
+    
+    def _failed_simulation_result(self, error: Exception, validation_result: Optional[ValidationResult]) -> SimulationResult:
+        """Result for a build whose execution raised"""
+        return SimulationResult(
+            success=False,
+            score=0.0,
+            message=f"Simulation failed: {str(error)}",
+            validation_result=validation_result
+        )
     
-    def _get_required_components(self, level_id: int) -> List[str]:
+    def _get_required_components(self, level_id: int) -> Tuple[str, ...]:
         """Get required components for a level"""
-        requirements = {
-            1: ["neural_layer"],
-            2: ["neural_layer", "activation"],
-            3: ["neural_layer", "tensor_add", "tensor_multiply"],
-            4: ["neural_layer", "activation", "dense_layer"]
-        }
-        return requirements.get(level_id, [])
-    
-    def _validate_component_sequence(self, components: List[Dict], issues: List[ValidationIssue]):
+        return _REQUIRED_BY_LEVEL.get(level_id, ())
+    
+    def _validate_component_sequence(self, components: Tuple[_NormalizedComponent, ...], issues: List[ValidationIssue]):
         """Validate that components are in a reasonable sequence"""
         if not components:
             return
         
         # Check for activation after layers
         has_layer = False
-        for i, comp in enumerate(components):
-            if isinstance(comp, dict):
-                comp_type = comp.get("type", "")
-                comp_id = comp.get("id", comp.get("name", ""))
-            else:
-                comp_type = getattr(comp, 'type', "")
-                comp_id = getattr(comp, 'id', "")
-            
-            if "layer" in comp_id.lower() or comp_type == "layer":
+        for comp in components:
+            if "layer" in comp.lowered_id or comp.type == "layer":
                 has_layer = True
-            elif "activation" in comp_id.lower() and not has_layer:
+            elif "activation" in comp.lowered_id and not has_layer:
                 issues.append(ValidationIssue(
                     type="sequence_error",
-                    component_id=comp_id,
+                    component_id=comp.id,
                     message="Activation function should come after a layer",
                     severity="warning",
                     hint="Try placing the activation function after a neural layer"
                 ))
     
-    def _validate_level_specific_requirements(self, build: ComponentBuild, level_id: int, issues: List[ValidationIssue]):
+    def _validate_level_specific_requirements(self, components: Tuple[_NormalizedComponent, ...], level_id: int,
+                                              issues: List[ValidationIssue]):
         """Validate level-specific requirements"""
         if level_id == 2:
             # Level 2 requires at least 3 components for complexity
-            if len(build.components) < 3:
+            if len(components) < 3:
                 issues.append(ValidationIssue(
                     type="insufficient_complexity",
                     component_id=None,
-                    message=f"Need at least 3 components, you have {len(build.components)}",
+                    message=f"Need at least 3 components, you have {len(components)}",
                     severity="warning",
                     hint="Add more components to make your network more sophisticated"
                 ))
         
         elif level_id == 4:
             # Mini-boss level requires higher complexity
-            if len(build.components) < 4:
+            if len(components) < 4:
                 issues.append(ValidationIssue(
                     type="insufficient_complexity",
                     component_id=None,
@@ -261,52 +625,41 @@ class TensorForgeSimulationEngine:
     
     def _generate_input_data(self, level_id: int) -> torch.Tensor:
         """Generate appropriate input data for a level"""
-        if level_id == 2:
-            return torch.tensor([1.0, 2.0, 3.0, 4.0])
-        elif level_id == 3:
-            return torch.tensor([0.5, 1.5, 2.5])
-        else:
-            return torch.tensor([1.0, 0.5, 0.8, 0.3])
+        return _LEVEL_INPUTS.get(level_id, _DEFAULT_INPUT)
     
-    def _evaluate_results(self, results: Dict[str, torch.Tensor], level_id: int, build: ComponentBuild) -> Tuple[bool, float, str, Dict]:
+    def _evaluate_results(self, results: Dict[str, torch.Tensor], level_id: int,
+                          components: Tuple[_NormalizedComponent, ...]) -> Tuple[bool, float, str, Dict]:
         """Evaluate simulation results against level criteria"""
-        final_output = list(results.values())[-1] if results else None
+        # Results are insertion-ordered, so the last entry is the final output
+        final_output = next(reversed(results.values()), None) if results else None
         
         if final_output is None:
             return False, 0.0, "No output generated", {}
         
         # Level-specific evaluation
         if level_id == 2:
-            return self._evaluate_level_2(results, build)
+            return self._evaluate_level_2(results, components)
         elif level_id == 3:
-            return self._evaluate_level_3(results, build)
+            return self._evaluate_level_3(results, components)
         elif level_id == 4:
-            return self._evaluate_mini_boss_1(results, build)
+            return self._evaluate_mini_boss_1(results, components)
         else:
-            return self._evaluate_generic(results, build)
+            return self._evaluate_generic(results, components)
     
-    def _evaluate_level_2(self, results: Dict[str, torch.Tensor], build: ComponentBuild) -> Tuple[bool, float, str, Dict]:
+    def _evaluate_level_2(self, results: Dict[str, torch.Tensor], components: Tuple[_NormalizedComponent, ...]) -> Tuple[bool, float, str, Dict]:
         """Evaluate Level 2 - Network Building"""
         try:
             score = 0.6  # Base score
             
             # Simple component counting and scoring
-            component_count = len(build.components)
+            component_count = len(components)
             score += min(0.3, component_count * 0.1)
             
-            # Check for essential components
-            component_ids = []
-            for comp in build.components:
-                if isinstance(comp, dict):
-                    comp_id = comp.get("id", "").lower()
-                else:
-                    comp_id = getattr(comp, 'id', "").lower()
-                component_ids.append(comp_id)
-            
-            if any("neural" in comp_id for comp_id in component_ids):
-                score += 0.1
-            if any("activation" in comp_id for comp_id in component_ids):
-                score += 0.1
+            # Check for essential components (one pass collects every keyword present)
+            component_types = set()
+            for comp in components:
+                component_types.update(token for token in _LEVEL_2_TOKENS if token in comp.lowered_id)
+            score += 0.1 * ("neural" in component_types) + 0.1 * ("activation" in component_types)
             
             score = min(0.95, score)
             success = score >= 0.85
@@ -326,34 +679,33 @@ class TensorForgeSimulationEngine:
             # Fallback evaluation
             return False, 0.5, f"Evaluation error: {str(e)}", {}
     
-    def _evaluate_level_3(self, results: Dict[str, torch.Tensor], build: ComponentBuild) -> Tuple[bool, float, str, Dict]:
+    def _evaluate_level_3(self, results: Dict[str, torch.Tensor], components: Tuple[_NormalizedComponent, ...]) -> Tuple[bool, float, str, Dict]:
         """Evaluate Level 3 - Pattern Detection"""
         # Simple pattern detection evaluation
-        score = 0.75 if len(build.components) >= 3 else 0.5
+        score = 0.75 if len(components) >= 3 else 0.5
         success = score >= 0.75
         
         message = "Pattern detection network built successfully!" if success else "Try adding more components for better pattern recognition."
         
         return success, score, message, {"pattern_score": score}
     
-    def _evaluate_mini_boss_1(self, results: Dict[str, torch.Tensor], build: ComponentBuild) -> Tuple[bool, float, str, Dict]:
+    def _evaluate_mini_boss_1(self, results: Dict[str, torch.Tensor], components: Tuple[_NormalizedComponent, ...]) -> Tuple[bool, float, str, Dict]:
         """Evaluate Mini-Boss 1 - Smart Pet Challenge"""
-        base_score = 0.7
-        
-        # Higher standards for mini-boss
-        if len(build.components) >= 4:
-            base_score += 0.1
-        if len(build.components) >= 5:
-            base_score += 0.05
+        component_count = len(components)
         
-        # Check for advanced components
-        has_dropout = any("dropout" in comp.get("id", "").lower() for comp in build.components)
-        has_dense = any("dense" in comp.get("id", "").lower() for comp in build.components)
+        # Check for advanced components (one pass collects every keyword present)
+        component_types = set()
+        for comp in components:
+            component_types.update(token for token in _MINI_BOSS_1_TOKENS if token in comp.lowered_id)
+        has_dropout = "dropout" in component_types
+        has_dense = "dense" in component_types
         
-        if has_dropout:
-            base_score += 0.08
-        if has_dense:
-            base_score += 0.07
+        # Higher standards for mini-boss; bonuses accumulate from the booleans in a fixed order
+        base_score = (0.7
+                      + 0.1 * (component_count >= 4)
+                      + 0.05 * (component_count >= 5)
+                      + 0.08 * has_dropout
+                      + 0.07 * has_dense)
         
         score = min(0.95, base_score)
         success = score >= 0.9
@@ -362,9 +714,9 @@ class TensorForgeSimulationEngine:
         
         return success, score, message, {"mini_boss_score": score}
     
-    def _evaluate_generic(self, results: Dict[str, torch.Tensor], build: ComponentBuild) -> Tuple[bool, float, str, Dict]:
+    def _evaluate_generic(self, results: Dict[str, torch.Tensor], components: Tuple[_NormalizedComponent, ...]) -> Tuple[bool, float, str, Dict]:
         """Generic evaluation for other levels"""
-        score = min(0.9, 0.6 + len(build.components) * 0.1)
+        score = min(0.9, 0.6 + len(components) * 0.1)
         success = score >= 0.8
         message = "Network simulation completed successfully!" if success else "Try improving your network architecture."
         
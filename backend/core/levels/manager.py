@@ -2,12 +2,24 @@
 Enhanced Levels Manager - Configuration Driven
 Manages educational AI levels with comprehensive progression system using YAML configuration.
 """
-from typing import Dict, List, Optional, Any
-from models.game_models import LevelConfig, PlayerProgress, ComponentType
+from typing import Dict, List, Optional, Any, FrozenSet, Tuple
+from models.game_models import LevelConfig, PlayerProgress, ComponentType, MasteryLevel
 from core.components.registry import component_registry
 from config.config_loader import config_loader
+import bisect
+import dataclasses
 import json
+import logging
 import os
+import time
+
+logger = logging.getLogger(__name__)
+
+# YAML keys that map straight onto LevelConfig fields
+_LEVEL_FIELDS = frozenset(f.name for f in dataclasses.fields(LevelConfig))
+
+# Production deployments can skip the startup consistency check of the level config
+_VALIDATE_CONFIG = os.environ.get("TF_SKIP_CONFIG_VALIDATION") != "1"
 
 class LevelsManager:
     """Enhanced manager for educational AI levels and progression"""
@@ -15,7 +27,13 @@ class LevelsManager:
     def __init__(self):
         self.levels: Dict[int, LevelConfig] = {}
         self.level_dependencies: Dict[int, List[int]] = {}
+        self._sorted_level_ids: List[int] = []
+        self._concepts_by_level: Dict[int, FrozenSet[str]] = {}
+        self._ordered_concepts_by_level: Dict[int, Tuple[str, ...]] = {}
+        self._difficulty_by_level: Dict[int, str] = {}
+        self._prereq_sets: Dict[int, FrozenSet[int]] = {}
         self._initialize_levels_from_config()
+        self._build_level_indexes()
     
     def get_level(self, level_id: int) -> Optional[LevelConfig]:
         """Get level configuration by ID"""
@@ -23,29 +41,27 @@ class LevelsManager:
     
     def get_available_levels(self, player_progress: PlayerProgress) -> List[int]:
         """Get list of levels available to the player"""
-        available = []
-        for level_id, level_config in self.levels.items():
-            if self._is_level_unlocked(level_id, player_progress):
-                available.append(level_id)
-        return sorted(available)
+        completed = player_progress.completed_levels.keys()
+        prereq_sets = self._prereq_sets
+        # Walking the pre-sorted ids keeps the result ordered without a sort
+        # (same rule as _is_level_unlocked, inlined to skip a call per level)
+        return [level_id for level_id in self._sorted_level_ids
+                if level_id == 1 or completed >= prereq_sets[level_id]]
     
-    def get_level_concepts(self, level_id: int) -> List[str]:
+    def get_level_concepts(self, level_id: int) -> Tuple[str, ...]:
         """Get concepts taught in a specific level"""
-        level = self.get_level(level_id)
-        return level.concepts if level else []
+        return self._ordered_concepts_by_level.get(level_id, ())
     
     def get_concepts_learned(self, player_progress: PlayerProgress) -> List[str]:
         """Get all concepts the player has learned"""
-        concepts = set()
-        for level_id in player_progress.completed_levels.keys():
-            concepts.update(self.get_level_concepts(level_id))
-        return sorted(list(concepts))
+        # Maintained by mark_level_complete (levels are never un-completed)
+        return sorted(player_progress.concepts_learned_cache)
     
     def get_next_level(self, current_level: int, player_progress: PlayerProgress) -> Optional[int]:
         """Get the next recommended level"""
         available_levels = self.get_available_levels(player_progress)
-        higher_levels = [l for l in available_levels if l > current_level]
-        return min(higher_levels) if higher_levels else None
+        index = bisect.bisect_right(available_levels, current_level)
+        return available_levels[index] if index < len(available_levels) else None
     
     def mark_level_complete(self, level_id: int, player_progress: PlayerProgress, 
                            score: float, time_taken: int, attempts: int = 1):
@@ -59,21 +75,27 @@ class LevelsManager:
         }
         
         player_progress.completed_levels[level_id] = level_record
+        player_progress.concepts_learned_cache.update(self._concepts_by_level.get(level_id, ()))
         
-        # Update concept mastery
+        # Update concept mastery - the level score and attempts give every concept the same mastery
         level_concepts = self.get_level_concepts(level_id)
-        for concept in level_concepts:
-            # Simple mastery calculation based on score and attempts
-            mastery_score = score * (1.0 / attempts) 
-            if mastery_score >= 0.9:
-                player_progress.concept_mastery[concept] = "proficient"
-            elif mastery_score >= 0.7:
-                player_progress.concept_mastery[concept] = "learning"
-            else:
-                player_progress.concept_mastery[concept] = "novice"
+        if not level_concepts:
+            return
+        mastery_score = score * (1.0 / attempts)
+        if mastery_score >= 0.9:
+            mastery = MasteryLevel.PROFICIENT
+        elif mastery_score >= 0.7:
+            mastery = MasteryLevel.LEARNING
+        else:
+            mastery = MasteryLevel.NOVICE
+        player_progress.concept_mastery.update(dict.fromkeys(level_concepts, mastery))
     
     def get_level_difficulty_rating(self, level_id: int) -> str:
         """Get difficulty rating for a level"""
+        return self._difficulty_by_level.get(level_id, "unknown")
+    
+    def _compute_difficulty_rating(self, level_id: int) -> str:
+        """Derive a level's difficulty rating from its type and position"""
         level = self.get_level(level_id)
         if not level:
             return "unknown"
@@ -89,31 +111,33 @@ class LevelsManager:
         else:
             return "advanced"
     
-    def _is_level_unlocked(self, level_id: int, player_progress: PlayerProgress) -> bool:
+    def _is_level_unlocked(self, level_id: int, player_progress: PlayerProgress,
+                           completed: Optional[Dict[int, Any]] = None) -> bool:
         """Check if a level is unlocked for the player"""
-        level = self.get_level(level_id)
-        if not level:
+        if completed is None:
+            completed = player_progress.completed_levels
+        required = self._prereq_sets.get(level_id)
+        if required is None:
             return False
         
-        # Level 1 is always unlocked
-        if level_id == 1:
-            return True
-        
-        # Check prerequisites
-        for prereq in level.prerequisites:
-            if prereq not in player_progress.completed_levels:
-                return False
-        
-        # For standard progression, just check if previous level is complete
-        if level_id - 1 in self.levels and level_id - 1 not in player_progress.completed_levels:
-            return False
-        
-        return True
+        # Level 1 is always unlocked; otherwise every unlock requirement must be completed
+        return level_id == 1 or completed.keys() >= required
     
     def _get_timestamp(self) -> int:
         """Get current timestamp"""
-        import time
-        return int(time.time())
+        return time.time_ns() // 1_000_000_000
+    
+    def _build_level_indexes(self):
+        """Precompute lookups derived from the loaded levels"""
+        self._sorted_level_ids = sorted(self.levels)
+        self._concepts_by_level = {level_id: frozenset(level.concepts) for level_id, level in self.levels.items()}
+        self._ordered_concepts_by_level = {level_id: tuple(level.concepts) for level_id, level in self.levels.items()}
+        self._difficulty_by_level = {level_id: self._compute_difficulty_rating(level_id) for level_id in self.levels}
+        # Unlock requirements: explicit prerequisites plus, for standard progression, the previous level
+        self._prereq_sets = {
+            level_id: frozenset(level.prerequisites) | ({level_id - 1} if level_id - 1 in self.levels else frozenset())
+            for level_id, level in self.levels.items()
+        }
     
     def _initialize_levels_from_config(self):
         """Initialize levels from YAML configuration"""
@@ -125,40 +149,36 @@ class LevelsManager:
                 if isinstance(level_id, str):
                     level_id = int(level_id)
                 
-                # Create LevelConfig from YAML data
-                self.levels[level_id] = LevelConfig(
-                    id=level_data.get('id', level_id),
-                    title=level_data.get('title', f'Level {level_id}'),
-                    description=level_data.get('description', ''),
-                    objective=level_data.get('objective', ''),
-                    concepts=level_data.get('concepts', []),
-                    available_components=level_data.get('available_components', []),
-                    success_criteria=level_data.get('success_criteria', {}),
-                    hints=level_data.get('hints', []),
-                    educational_content=level_data.get('educational_content', {}),
-                    type=level_data.get('type', 'standard'),
-                    prerequisites=level_data.get('prerequisites', []),
-                    max_attempts=level_data.get('max_attempts'),
-                    time_limit=level_data.get('time_limit')
-                )
-            
-            print(f"📚 Loaded {len(self.levels)} levels from configuration")
+                # Create LevelConfig from YAML data (unknown keys are ignored,
+                # optional fields fall back to the dataclass defaults)
+                fields = {key: value for key, value in level_data.items() if key in _LEVEL_FIELDS}
+                fields.setdefault('id', level_id)
+                fields.setdefault('title', f'Level {level_id}')
+                fields.setdefault('description', '')
+                fields.setdefault('objective', '')
+                fields.setdefault('concepts', [])
+                fields.setdefault('available_components', [])
+                fields.setdefault('success_criteria', {})
+                self.levels[level_id] = LevelConfig(**fields)
             
-            # Validate configuration
-            validation_result = config_loader.validate_config()
-            if validation_result["errors"]:
-                print("⚠️  Configuration errors found:")
-                for error in validation_result["errors"]:
-                    print(f"   - {error}")
+            logger.info("📚 Loaded %d levels from configuration", len(self.levels))
             
-            if validation_result["warnings"]:
-                print("⚠️  Configuration warnings:")
-                for warning in validation_result["warnings"]:
-                    print(f"   - {warning}")
+            # Validate configuration (only worth running if the findings would be logged)
+            if _VALIDATE_CONFIG and logger.isEnabledFor(logging.WARNING):
+                validation_result = config_loader.validate_config()
+                if validation_result["errors"]:
+                    logger.warning("⚠️  Configuration errors found:")
+                    for error in validation_result["errors"]:
+                        logger.warning("   - %s", error)
+                
+                if validation_result["warnings"]:
+                    logger.warning("⚠️  Configuration warnings:")
+                    for warning in validation_result["warnings"]:
+                        logger.warning("   - %s", warning)
                     
         except Exception as e:
-            print(f"❌ Error loading levels from config: {e}")
-            print("   Falling back to hardcoded levels...")
+            logger.error("❌ Error loading levels from config: %s", e)
+            logger.error("   Falling back to hardcoded levels...")
             self._initialize_fallback_levels()
     
     def _initialize_fallback_levels(self):
@@ -225,5 +245,12 @@ class LevelsManager:
             prerequisites=[1]
         )
 
-# Global levels manager instance
-levels_manager = LevelsManager()
\ No newline at end of file
+# Global levels manager instance, built on first use so importing this module stays cheap
+_instance: Optional[LevelsManager] = None
+
+def get_levels_manager() -> LevelsManager:
+    """Get the shared levels manager, loading the level configuration on first call"""
+    global _instance
+    if _instance is None:
+        _instance = LevelsManager()
+    return _instance
\ No newline at end of file
@@ -1,7 +1,139 @@
 import torch
 import torch.nn as nn
-from typing import Dict, List, Any, Callable
-from engine import TensorForgeEngine, EducationalLinearLayer, EducationalActivation
+import operator
+from typing import Dict, List, Any, Callable, Optional, Tuple, Mapping
+from types import MappingProxyType
+from engine import TensorForgeEngine, EducationalLinearLayer, EducationalActivation, script_module
+
+# Level catalog - static, so built by the first manager and shared afterwards
+_LEVELS_TEMPLATE: Optional[Dict[int, Dict[str, Any]]] = None
+_LEVEL_VIEWS: Dict[int, Mapping[str, Any]] = {}
+_EMPTY_PROXY: Mapping[str, Any] = MappingProxyType({})
+
+def _level_tensor(values: List[float]) -> torch.Tensor:
+    """A constant level tensor, pinned when CUDA is available so copies can be non_blocking"""
+    tensor = torch.tensor(values).requires_grad_(False)
+    return tensor.pin_memory() if torch.cuda.is_available() else tensor
+
+# Level 2 simulation input and target (use .to(device, non_blocking=True) to move them)
+_LEVEL_2_INPUTS = _level_tensor([1.0, 2.0, 3.0])
+_LEVEL_2_TARGET = _level_tensor([3.0, 6.0, 9.0])
+
+# Per-level component catalogs - static, so built once and shared
+# Components available in Level 1
+_LEVEL_1_COMPONENTS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        'id': 'neural_layer',
+        'name': 'Neural Layer',
+        'description': 'A layer of artificial neurons that can learn',
+        'type': 'layer',
+        'icon': 'brain',
+        'educational_note': 'This is where the magic happens - neurons learn to recognize patterns!'
+    }),
+    MappingProxyType({
+        'id': 'activation_relu',
+        'name': 'ReLU Activation',
+        'description': 'Helps the AI learn complex patterns',
+        'type': 'activation',
+        'icon': 'zap',
+        'educational_note': 'ReLU means "turn negative thoughts into zero" - it helps AI focus on positive signals!'
+    }),
+    MappingProxyType({
+        'id': 'training_loop',
+        'name': 'Training Loop',
+        'description': 'Teaches the AI by showing it examples repeatedly',
+        'type': 'training',
+        'icon': 'repeat',
+        'educational_note': 'Just like humans, AI gets better with practice!'
+    })
+)
+
+# Components available in Level 2
+_LEVEL_2_COMPONENTS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        'id': 'tensor_add',
+        'name': 'Tensor Addition',
+        'description': 'Add two tensors together',
+        'type': 'operation',
+        'icon': 'plus',
+        'educational_note': 'Addition is how AI combines information from different sources!'
+    }),
+    MappingProxyType({
+        'id': 'tensor_multiply',
+        'name': 'Tensor Multiplication',
+        'description': 'Multiply tensors element-wise',
+        'type': 'operation', 
+        'icon': 'x',
+        'educational_note': 'Multiplication is how AI amplifies important signals!'
+    }),
+    MappingProxyType({
+        'id': 'scalar_multiply',
+        'name': 'Scalar Multiply',
+        'description': 'Scale a tensor by a number',
+        'type': 'operation',
+        'icon': 'trending-up',
+        'educational_note': 'Scaling helps AI adjust the strength of its responses!'
+    })
+)
+
+# Components available in Level 3
+_LEVEL_3_COMPONENTS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        'id': 'linear_layer',
+        'name': 'Linear Layer',
+        'description': 'The foundation of all neural networks',
+        'type': 'layer',
+        'icon': 'layers',
+        'educational_note': 'Linear layers are like AI\'s way of drawing conclusions from data!'
+    }),
+    MappingProxyType({
+        'id': 'weight_matrix',
+        'name': 'Weight Matrix',
+        'description': 'How the AI remembers what it learned',
+        'type': 'parameter',
+        'icon': 'grid',
+        'educational_note': 'Weights are the AI\'s memory - they store everything it learns!'
+    }),
+    MappingProxyType({
+        'id': 'bias_vector',
+        'name': 'Bias Vector',
+        'description': 'The AI\'s starting assumptions',
+        'type': 'parameter',
+        'icon': 'anchor',
+        'educational_note': 'Bias helps AI make good guesses even with limited information!'
+    })
+)
+
+# Special mini-boss components
+_MINI_BOSS_1_EXTRA_COMPONENTS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType({
+        'id': 'multi_classifier',
+        'name': 'Multi-Class Classifier',
+        'description': 'Can recognize many different types of things',
+        'type': 'advanced_layer',
+        'icon': 'layers-2',
+        'educational_note': 'This is how AI learns to tell the difference between many things at once!'
+    }),
+    MappingProxyType({
+        'id': 'confidence_meter',
+        'name': 'Confidence Meter',
+        'description': 'Shows how sure the AI is about its answer',
+        'type': 'evaluation',
+        'icon': 'gauge',
+        'educational_note': 'Good AI knows when it\'s unsure - just like smart humans!'
+    })
+)
+
+# Mini-Boss 1 combines all components from levels 1-3
+_MINI_BOSS_1_COMPONENTS = _LEVEL_1_COMPONENTS + _LEVEL_2_COMPONENTS + _LEVEL_3_COMPONENTS + _MINI_BOSS_1_EXTRA_COMPONENTS
+
+# Shared activation modules - stateless, so one instance serves every build
+_RELU = script_module(EducationalActivation('relu'))
+_SIGMOID = script_module(EducationalActivation('sigmoid'))
+
+def _create_linear_layer(input_size: int, output_size: int) -> nn.Module:
+    """Factory for the linear_layer component"""
+    return script_module(EducationalLinearLayer(input_size, output_size))
 
 class LevelsManager:
     """Manages educational AI levels and progression"""
@@ -11,9 +143,19 @@ class LevelsManager:
         self.levels: Dict[int, Dict[str, Any]] = {}
         self.current_level = 1
         self.player_progress = {}
+        self._concepts_learned: set = set()
+        self._concepts_sorted_cache: Optional[Tuple[str, ...]] = None
+        
+        # Initialize all levels (once per process - the catalog never changes)
+        global _LEVELS_TEMPLATE
+        if _LEVELS_TEMPLATE is None:
+            self._initialize_levels()
+            _LEVEL_VIEWS.update({level_id: MappingProxyType(level) for level_id, level in self.levels.items()})
+            _LEVELS_TEMPLATE = self.levels
+        self.levels = _LEVELS_TEMPLATE
         
-        # Initialize all levels
-        self._initialize_levels()
+        # Components never change between levels, so register them once
+        self._register_components()
         
     def _initialize_levels(self):
         """Initialize all 21 levels with educational content"""
@@ -48,8 +190,8 @@ class LevelsManager:
             'objective': 'Master basic tensor operations: addition and multiplication',
             'concepts': ['tensors', 'vector operations', 'element-wise operations'],
             'components': self._get_level_2_components(),
-            'inputs': torch.tensor([1.0, 2.0, 3.0]),
-            'target': torch.tensor([3.0, 6.0, 9.0]),
+            'inputs': _LEVEL_2_INPUTS,
+            'target': _LEVEL_2_TARGET,
             'educational_content': {
                 'intro': 'Tensors are like super-powered lists that AI uses to think!',
                 'concepts_explained': {
@@ -102,122 +244,21 @@ class LevelsManager:
         # Continue with levels 5-21 (abbreviated for now)
         self._initialize_advanced_levels()
         
-    def _get_level_1_components(self) -> List[Dict[str, Any]]:
+    def _get_level_1_components(self) -> Tuple[Mapping[str, Any], ...]:
         """Components available in Level 1"""
-        return [
-            {
-                'id': 'neural_layer',
-                'name': 'Neural Layer',
-                'description': 'A layer of artificial neurons that can learn',
-                'type': 'layer',
-                'icon': 'brain',
-                'educational_note': 'This is where the magic happens - neurons learn to recognize patterns!'
-            },
-            {
-                'id': 'activation_relu',
-                'name': 'ReLU Activation',
-                'description': 'Helps the AI learn complex patterns',
-                'type': 'activation',
-                'icon': 'zap',
-                'educational_note': 'ReLU means "turn negative thoughts into zero" - it helps AI focus on positive signals!'
-            },
-            {
-                'id': 'training_loop',
-                'name': 'Training Loop',
-                'description': 'Teaches the AI by showing it examples repeatedly',
-                'type': 'training',
-                'icon': 'repeat',
-                'educational_note': 'Just like humans, AI gets better with practice!'
-            }
-        ]
+        return _LEVEL_1_COMPONENTS
         
-    def _get_level_2_components(self) -> List[Dict[str, Any]]:
+    def _get_level_2_components(self) -> Tuple[Mapping[str, Any], ...]:
         """Components available in Level 2"""
-        return [
-            {
-                'id': 'tensor_add',
-                'name': 'Tensor Addition',
-                'description': 'Add two tensors together',
-                'type': 'operation',
-                'icon': 'plus',
-                'educational_note': 'Addition is how AI combines information from different sources!'
-            },
-            {
-                'id': 'tensor_multiply',
-                'name': 'Tensor Multiplication',
-                'description': 'Multiply tensors element-wise',
-                'type': 'operation', 
-                'icon': 'x',
-                'educational_note': 'Multiplication is how AI amplifies important signals!'
-            },
-            {
-                'id': 'scalar_multiply',
-                'name': 'Scalar Multiply',
-                'description': 'Scale a tensor by a number',
-                'type': 'operation',
-                'icon': 'trending-up',
-                'educational_note': 'Scaling helps AI adjust the strength of its responses!'
-            }
-        ]
+        return _LEVEL_2_COMPONENTS
         
-    def _get_level_3_components(self) -> List[Dict[str, Any]]:
+    def _get_level_3_components(self) -> Tuple[Mapping[str, Any], ...]:
         """Components available in Level 3"""
-        return [
-            {
-                'id': 'linear_layer',
-                'name': 'Linear Layer',
-                'description': 'The foundation of all neural networks',
-                'type': 'layer',
-                'icon': 'layers',
-                'educational_note': 'Linear layers are like AI\'s way of drawing conclusions from data!'
-            },
-            {
-                'id': 'weight_matrix',
-                'name': 'Weight Matrix',
-                'description': 'How the AI remembers what it learned',
-                'type': 'parameter',
-                'icon': 'grid',
-                'educational_note': 'Weights are the AI\'s memory - they store everything it learns!'
-            },
-            {
-                'id': 'bias_vector',
-                'name': 'Bias Vector',
-                'description': 'The AI\'s starting assumptions',
-                'type': 'parameter',
-                'icon': 'anchor',
-                'educational_note': 'Bias helps AI make good guesses even with limited information!'
-            }
-        ]
+        return _LEVEL_3_COMPONENTS
         
-    def _get_mini_boss_1_components(self) -> List[Dict[str, Any]]:
+    def _get_mini_boss_1_components(self) -> Tuple[Mapping[str, Any], ...]:
         """Components available in Mini-Boss 1"""
-        # Combine all components from levels 1-3
-        components = []
-        components.extend(self._get_level_1_components())
-        components.extend(self._get_level_2_components())
-        components.extend(self._get_level_3_components())
-        
-        # Add special mini-boss components
-        components.extend([
-            {
-                'id': 'multi_classifier',
-                'name': 'Multi-Class Classifier',
-                'description': 'Can recognize many different types of things',
-                'type': 'advanced_layer',
-                'icon': 'layers-2',
-                'educational_note': 'This is how AI learns to tell the difference between many things at once!'
-            },
-            {
-                'id': 'confidence_meter',
-                'name': 'Confidence Meter',
-                'description': 'Shows how sure the AI is about its answer',
-                'type': 'evaluation',
-                'icon': 'gauge',
-                'educational_note': 'Good AI knows when it\'s unsure - just like smart humans!'
-            }
-        ])
-        
-        return components
+        return _MINI_BOSS_1_COMPONENTS
         
     def _initialize_advanced_levels(self):
         """Initialize levels 5-21 with increasing complexity"""
@@ -242,10 +283,10 @@ class LevelsManager:
         # Continue pattern for all 21 levels...
         # (Implementation can be expanded as needed)
         
-    def get_level(self, level_id: int) -> Dict[str, Any]:
-        """Get level configuration"""
-        return self.levels.get(level_id, {})
-        
+    def get_level(self, level_id: int) -> Mapping[str, Any]:
+        """Get level configuration (a shared read-only view)"""
+        return _LEVEL_VIEWS.get(level_id, _EMPTY_PROXY)
+    
     def load_level(self, level_id: int) -> bool:
         """Load a level into the engine"""
         level = self.levels.get(level_id)
@@ -255,33 +296,24 @@ class LevelsManager:
         # Clear previous level
         self.engine.reset_build()
         
-        # Load level components into engine
-        self._load_level_components(level_id)
-        
         # Set level data
         self.engine.level_data = level
         self.current_level = level_id
         
         return True
         
-    def _load_level_components(self, level_id: int):
-        """Load level-specific components into the engine"""
+    def _register_components(self):
+        """Load the level components into the engine"""
         
         # Basic tensor operations (available in most levels)
         self.engine.add_component('tensor_add', torch.add)
         self.engine.add_component('tensor_multiply', torch.multiply)
-        self.engine.add_component('scalar_multiply', lambda x, scalar: x * scalar)
+        self.engine.add_component('scalar_multiply', operator.mul)
         
         # Neural network components
-        def create_linear_layer(input_size, output_size):
-            return EducationalLinearLayer(input_size, output_size)
-            
-        def create_activation(activation_type='relu'):
-            return EducationalActivation(activation_type)
-            
-        self.engine.add_component('linear_layer', create_linear_layer)
-        self.engine.add_component('activation_relu', lambda x: create_activation('relu')(x))
-        self.engine.add_component('activation_sigmoid', lambda x: create_activation('sigmoid')(x))
+        self.engine.add_component('linear_layer', _create_linear_layer)
+        self.engine.add_component('activation_relu', _RELU)
+        self.engine.add_component('activation_sigmoid', _SIGMOID)
         
     def get_progress(self) -> Dict[str, Any]:
         """Get player progress information"""
@@ -293,13 +325,12 @@ class LevelsManager:
             'concepts_learned': self._get_concepts_learned()
         }
         
-    def _get_concepts_learned(self) -> List[str]:
+    def _get_concepts_learned(self) -> Tuple[str, ...]:
         """Get list of AI concepts the player has learned"""
-        concepts = set()
-        for level_id in self.player_progress.keys():
-            level = self.levels.get(level_id, {})
-            concepts.update(level.get('concepts', []))
-        return sorted(list(concepts))
+        # Concepts are added in mark_level_complete; sort only after they change
+        if self._concepts_sorted_cache is None:
+            self._concepts_sorted_cache = tuple(sorted(self._concepts_learned))
+        return self._concepts_sorted_cache
         
     def mark_level_complete(self, level_id: int, score: float, time_taken: int):
         """Mark a level as completed"""
@@ -309,6 +340,11 @@ class LevelsManager:
             'time_taken': time_taken,
             'type': self.levels[level_id].get('type', 'normal')
         }
+        
+        new_concepts = set(self.levels[level_id].get('concepts', [])) - self._concepts_learned
+        if new_concepts:
+            self._concepts_learned |= new_concepts
+            self._concepts_sorted_cache = None
 
 # Testing
 if __name__ == "__main__":
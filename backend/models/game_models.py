@@ -3,11 +3,12 @@ Tensor Forge Game Models
 Comprehensive data models for the game system.
 """
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Callable, Union
-from enum import Enum
+from typing import List, Dict, Any, Optional, Callable, Union, Set
+from enum import Enum, IntEnum
 import torch
 
-class ComponentType(Enum):
+class ComponentType(str, Enum):
+    """Component category - a ``str`` subclass, so members serialize as their value"""
     LAYER = "layer"
     ACTIVATION = "activation"  
     OPERATION = "operation"
@@ -22,13 +23,20 @@ class GamePhase(Enum):
     TRAINING = "training"
     COMPLETE = "complete"
 
-class MasteryLevel(Enum):
-    NOVICE = "novice"
-    LEARNING = "learning" 
-    PROFICIENT = "proficient"
-    EXPERT = "expert"
+class MasteryLevel(IntEnum):
+    """Concept mastery rank - an ``int`` subclass, so levels compare and sum as integers"""
+    NOVICE = 0
+    LEARNING = 1
+    PROFICIENT = 2
+    EXPERT = 3
+    
+    def __str__(self) -> str:
+        return _MASTERY_NAMES[self]
 
-@dataclass
+# Wire names of the mastery levels, indexed by rank
+_MASTERY_NAMES = ("novice", "learning", "proficient", "expert")
+
+@dataclass(slots=True)
 class TensorSpec:
     """Specification for tensor input/output requirements"""
     name: str
@@ -36,7 +44,7 @@ class TensorSpec:
     dtype: str = "float32"
     description: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class Component:
     """Enhanced component definition with full metadata"""
     id: str
@@ -51,14 +59,14 @@ class Component:
     level_introduced: int = 1
     prerequisites: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class ComponentBuild:
     """Represents a player's component assembly"""
     components: List[Dict[str, Any]]
     connections: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class ValidationIssue:
     """Represents a validation problem with a build"""
     type: str
@@ -67,14 +75,14 @@ class ValidationIssue:
     severity: str  # "error", "warning", "info"
     hint: Optional[str] = None
 
-@dataclass 
+@dataclass(slots=True)
 class ValidationResult:
     """Result of build validation"""
     is_valid: bool
     issues: List[ValidationIssue]
     suggestions: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResult:
     """Enhanced simulation result with detailed feedback"""
     success: bool
@@ -85,9 +93,9 @@ class SimulationResult:
     educational_feedback: List[str] = field(default_factory=list)
     concept_progress: Dict[str, float] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class LevelConfig:
-    """Complete level configuration"""
+    """Complete level configuration (immutable once loaded)"""
     id: int
     title: str
     description: str
@@ -102,7 +110,7 @@ class LevelConfig:
     max_attempts: Optional[int] = None
     time_limit: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class PlayerProgress:
     """Comprehensive player progress tracking"""
     player_id: str
@@ -112,8 +120,9 @@ class PlayerProgress:
     total_playtime: int = 0
     achievements: List[str] = field(default_factory=list)
     preferences: Dict[str, Any] = field(default_factory=dict)
+    concepts_learned_cache: Set[str] = field(default_factory=set)  # Union of completed levels' concepts
 
-@dataclass
+@dataclass(slots=True)
 class Hint:
     """Intelligent hint with context"""
     content: str
@@ -122,7 +131,7 @@ class Hint:
     prerequisites: List[str] = field(default_factory=list)
     visual_highlight: Optional[str] = None  # Component or area to highlight
 
-@dataclass
+@dataclass(slots=True)
 class HintAnalysis:
     """Analysis of player's current situation for hint generation"""
     missing_components: List[str]
@@ -4,20 +4,28 @@ Educational AI puzzle game backend with comprehensive learning system.
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+import logging
+import os
 import uvicorn
 
-from api.game_endpoints import game_router
+from api.game_endpoints import game_router, warm_level_payloads
 from core.components.registry import component_registry
-from core.levels.manager import levels_manager
+from core.levels.manager import get_levels_manager
 from core.engine.simulation import simulation_engine
+from core.engine.batching import simulation_batcher
 from core.education.hints import hint_system
 from core.education.progress import concept_tracker, learning_analytics
 
+# Uvicorn configures only its own loggers, so log through its error logger to be seen
+logger = logging.getLogger("uvicorn.error")
+
 # Create FastAPI app
 app = FastAPI(
     title="Tensor Forge API", 
     version="2.0.0-enhanced",
-    description="Educational AI puzzle game backend with comprehensive learning system"
+    description="Educational AI puzzle game backend with comprehensive learning system",
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware - allow frontend to connect
@@ -25,8 +33,8 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, specify exact origins
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],  # Everything the API serves
+    allow_headers=["Content-Type", "Authorization"],
 )
 
 # Include game endpoints
@@ -36,14 +44,21 @@ app.include_router(game_router)
 @app.on_event("startup")
 async def startup_event():
     """Initialize the game systems on startup"""
-    print("🚀 Starting Tensor Forge Enhanced API...")
+    # Start the simulate-build micro-batcher
+    await simulation_batcher.start()
+    
+    # Level responses are static - serialize them before the first request arrives
+    warm_level_payloads()
     
-    # Verify core systems are initialized
-    print(f"📚 Loaded {len(levels_manager.levels)} levels")
-    print(f"🧩 Registered {len(component_registry.components)} components")
-    print("🎯 Hint system ready")
-    print("📊 Analytics system ready")
-    print("✅ All systems initialized successfully!")
+    # Verify core systems are initialized - one record per worker instead of a burst of prints
+    logger.info("Tensor Forge Enhanced API started: levels=%d components=%d (hints, analytics, batcher ready)",
+                len(get_levels_manager().levels), len(component_registry.components))
+
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background game systems on shutdown"""
+    await simulation_batcher.stop()
 
 # Root endpoint
 @app.get("/")
@@ -74,18 +89,36 @@ async def root():
 # Error handlers
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return {"error": "Endpoint not found", "message": "The requested resource does not exist"}
+    return ORJSONResponse(
+        {"error": "Endpoint not found", "message": "The requested resource does not exist"},
+        status_code=404
+    )
 
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
-    return {"error": "Internal server error", "message": "An unexpected error occurred"}
+    return ORJSONResponse(
+        {"error": "Internal server error", "message": "An unexpected error occurred"},
+        status_code=500
+    )
 
 # Development server
 if __name__ == "__main__":
+    # TF_WORKERS > 1 runs multiple worker processes (auto-reload only works with a single worker).
+    # All game state is in-process: each worker has its own player store, analytics, validation
+    # cache and batcher, so a progress update and the read after it can land on different workers
+    # and disagree, and a build_hash from /simulate-build often misses on /hint. Only run more
+    # than one worker for stateless load (level/component reads, simulations).
+    workers = int(os.environ.get("TF_WORKERS", "1"))
+    if workers > 1:
+        logger.warning("TF_WORKERS=%d: player progress, analytics and build_hash caches are per worker "
+                       "and not shared between them", workers)
     uvicorn.run(
         "server:app", 
         host="0.0.0.0", 
         port=8001,
-        reload=True,
-        log_level="info"
+        reload=workers == 1,
+        workers=workers,
+        log_level="info",
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file
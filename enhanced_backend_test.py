@@ -4,85 +4,74 @@ Enhanced Tensor Forge Backend API Test Suite
 Tests all enhanced API endpoints including hints, components, and progress tracking
 """
 
-import requests
+import orjson
 import sys
-import json
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 
-class EnhancedTensorForgeAPITester:
-    def __init__(self, base_url="https://472b03e2-49c6-4e1d-a49b-f4a6b3bcb67a.preview.emergentagent.com"):
-        self.base_url = base_url
-        self.tests_run = 0
-        self.tests_passed = 0
-        self.test_results = []
+from tester_base import BaseAPITester, main as run_suite_main
 
-    def log_test(self, name, success, message="", response_data=None):
-        """Log test result"""
-        self.tests_run += 1
-        if success:
-            self.tests_passed += 1
-            print(f"✅ {name}: PASSED - {message}")
-        else:
-            print(f"❌ {name}: FAILED - {message}")
-        
-        self.test_results.append({
-            "test": name,
-            "success": success,
-            "message": message,
-            "response_data": response_data
-        })
+# Request fixtures, built and serialized once
+# Level 1 player stuck without training data
+HINT_DATA = {
+    "level_id": 1,
+    "player_state": {
+        "components": ["neural_layer"],
+        "training_data_count": 0,
+        "last_error": "insufficient_data"
+    }
+}
+HINT_DATA_BYTES = orjson.dumps(HINT_DATA)
 
-    def run_test(self, name, method, endpoint, expected_status, data=None, expected_fields=None):
-        """Run a single API test"""
-        url = f"{self.base_url}/{endpoint}"
-        headers = {'Content-Type': 'application/json'}
+# Wall-clock anchor for _fast_iso - later timestamps are offset from it by the monotonic clock
+_BASE_TS = datetime.now(timezone.utc)
+_BASE_MONO = time.monotonic()
 
-        print(f"\n🔍 Testing {name}...")
-        print(f"   URL: {url}")
-        
-        try:
-            if method == 'GET':
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, json=data, headers=headers, timeout=30)
-            else:
-                self.log_test(name, False, f"Unsupported method: {method}")
-                return False, {}
+def _fast_iso():
+    """Current UTC time as an ISO string, without a clock and tz lookup per call"""
+    return (_BASE_TS + timedelta(seconds=time.monotonic() - _BASE_MONO)).isoformat()
 
-            print(f"   Status: {response.status_code}")
-            
-            # Check status code
-            if response.status_code != expected_status:
-                self.log_test(name, False, f"Expected status {expected_status}, got {response.status_code}")
-                return False, {}
+# Progress event - only the timestamp is filled in per request
+PROGRESS_DATA_TEMPLATE = {
+    "player_id": "test_player_123",
+    "level_id": 1,
+    "action": "component_added",
+    "component": "neural_layer"
+}
 
-            # Parse JSON response
-            try:
-                response_json = response.json()
-            except json.JSONDecodeError:
-                self.log_test(name, False, "Invalid JSON response")
-                return False, {}
+# Level 2 build: neural, activation and dense layers
+BUILD_DATA_L2 = {
+    "components": [
+        {"name": "Neural Layer", "type": "layer", "id": "neural_layer"},
+        {"name": "Activation Function", "type": "function", "id": "activation_relu"},
+        {"name": "Dense Layer", "type": "layer", "id": "dense_layer"}
+    ],
+    "level_id": 2
+}
+BUILD_DATA_L2_BYTES = orjson.dumps(BUILD_DATA_L2)
 
-            # Check expected fields if provided
-            if expected_fields:
-                missing_fields = []
-                for field in expected_fields:
-                    if field not in response_json:
-                        missing_fields.append(field)
-                
-                if missing_fields:
-                    self.log_test(name, False, f"Missing fields: {missing_fields}")
-                    return False, response_json
+# Mini-boss build: Level 2 build plus dropout
+BUILD_DATA_L4 = {
+    "components": [
+        {"name": "Neural Layer", "type": "layer", "id": "neural_layer"},
+        {"name": "Activation Function", "type": "function", "id": "activation_relu"},
+        {"name": "Dense Layer", "type": "layer", "id": "dense_layer"},
+        {"name": "Dropout", "type": "regularization", "id": "dropout"}
+    ],
+    "level_id": 4
+}
+BUILD_DATA_L4_BYTES = orjson.dumps(BUILD_DATA_L4)
 
-            self.log_test(name, True, "All checks passed", response_json)
-            return True, response_json
+class EnhancedTensorForgeAPITester(BaseAPITester):
+    TITLE = "Enhanced Tensor Forge API Tests"
+    SUMMARY_TITLE = "ENHANCED TEST SUMMARY"
+    SUCCESS_MESSAGE = "All enhanced tests passed! Backend API is fully functional."
+    RULE_WIDTH = 60
 
-        except requests.exceptions.RequestException as e:
-            self.log_test(name, False, f"Request failed: {str(e)}")
-            return False, {}
-        except Exception as e:
-            self.log_test(name, False, f"Unexpected error: {str(e)}")
-            return False, {}
+    _COMPONENTS_FIELDS = frozenset({"components"})
+    _HINT_FIELDS = frozenset({"hint", "type"})
+    _PROGRESS_UPDATE_FIELDS = frozenset({"success", "message"})
+    _PROGRESS_FIELDS = frozenset({"player_id", "analytics"})
 
     def test_health_check(self):
         """Test health check endpoint"""
@@ -91,7 +80,7 @@ class EnhancedTensorForgeAPITester:
             "GET",
             "api/health",
             200,
-            expected_fields=["status", "message"]
+            expected_fields=self._HEALTH_FIELDS
         )
 
     def test_get_components(self):
@@ -101,12 +90,12 @@ class EnhancedTensorForgeAPITester:
             "GET",
             "api/components",
             200,
-            expected_fields=["components"]
+            expected_fields=self._COMPONENTS_FIELDS
         )
         
         if success:
             components = response.get("components", [])
-            print(f"   ✓ Found {len(components)} components")
+            self._emit(f"   ✓ Found {len(components)} components")
             
             # Check for expected components
             expected_components = ["neural_layer", "activation_relu", "dense_layer", "dropout", "tensor_add", "tensor_multiply"]
@@ -114,9 +103,9 @@ class EnhancedTensorForgeAPITester:
             
             for expected in expected_components:
                 if expected in found_components:
-                    print(f"   ✓ Found component: {expected}")
+                    self._emit(f"   ✓ Found component: {expected}")
                 else:
-                    print(f"   ⚠ Missing component: {expected}")
+                    self._emit(f"   ⚠ Missing component: {expected}")
         
         return success, response
 
@@ -127,17 +116,17 @@ class EnhancedTensorForgeAPITester:
             "GET", 
             "api/levels/2",
             200,
-            expected_fields=["id", "title", "description", "available_components"]
+            expected_fields=self._LEVEL_FIELDS
         )
         
         if success:
             if response.get("id") == 2:
-                print("   ✓ Level ID correct")
+                self._emit("   ✓ Level ID correct")
             components = response.get("available_components", [])
             if len(components) >= 3:
-                print(f"   ✓ Found {len(components)} components for Level 2")
+                self._emit(f"   ✓ Found {len(components)} components for Level 2")
             else:
-                print(f"   ⚠ Expected at least 3 components, found {len(components)}")
+                self._emit(f"   ⚠ Expected at least 3 components, found {len(components)}")
         
         return success, response
 
@@ -148,54 +137,39 @@ class EnhancedTensorForgeAPITester:
             "GET", 
             "api/levels/4",
             200,
-            expected_fields=["id", "title", "description", "available_components"]
+            expected_fields=self._LEVEL_FIELDS
         )
         
         if success:
             if response.get("id") == 4:
-                print("   ✓ Level 4 ID correct")
+                self._emit("   ✓ Level 4 ID correct")
             components = response.get("available_components", [])
-            print(f"   ✓ Found {len(components)} components for Level 4")
+            self._emit(f"   ✓ Found {len(components)} components for Level 4")
         
         return success, response
 
     def test_hint_system(self):
         """Test adaptive hint system"""
-        hint_data = {
-            "level_id": 1,
-            "player_state": {
-                "components": ["neural_layer"],
-                "training_data_count": 0,
-                "last_error": "insufficient_data"
-            }
-        }
-        
         success, response = self.run_test(
             "Get Adaptive Hint",
             "POST",
             "api/hint",
             200,
-            data=hint_data,
-            expected_fields=["hint", "type"]
+            data_bytes=HINT_DATA_BYTES,
+            expected_fields=self._HINT_FIELDS
         )
         
         if success:
             hint_text = response.get("hint", "")
             hint_type = response.get("type", "")
-            print(f"   ✓ Hint type: {hint_type}")
-            print(f"   ✓ Hint text: {hint_text[:50]}...")
+            self._emit(f"   ✓ Hint type: {hint_type}")
+            self._emit(f"   ✓ Hint text: {hint_text[:50]}...")
         
         return success, response
 
     def test_progress_update(self):
         """Test progress tracking update"""
-        progress_data = {
-            "player_id": "test_player_123",
-            "level_id": 1,
-            "action": "component_added",
-            "component": "neural_layer",
-            "timestamp": datetime.now().isoformat()
-        }
+        progress_data = dict(PROGRESS_DATA_TEMPLATE, timestamp=_fast_iso())
         
         success, response = self.run_test(
             "Update Progress",
@@ -203,7 +177,7 @@ class EnhancedTensorForgeAPITester:
             "api/progress/update",
             200,
             data=progress_data,
-            expected_fields=["success", "message"]
+            expected_fields=self._PROGRESS_UPDATE_FIELDS
         )
         
         return success, response
@@ -215,122 +189,74 @@ class EnhancedTensorForgeAPITester:
             "GET",
             "api/progress/test_player_123",
             200,
-            expected_fields=["player_id", "analytics"]
+            expected_fields=self._PROGRESS_FIELDS
         )
         
         if success:
             analytics = response.get("analytics", {})
-            print(f"   ✓ Analytics keys: {list(analytics.keys())}")
+            self._emit(f"   ✓ Analytics keys: {list(analytics.keys())}")
         
         return success, response
 
     def test_level_2_simulation(self):
         """Test Level 2 simulation with multiple components"""
-        build_data = {
-            "components": [
-                {"name": "Neural Layer", "type": "layer", "id": "neural_layer"},
-                {"name": "Activation Function", "type": "function", "id": "activation_relu"},
-                {"name": "Dense Layer", "type": "layer", "id": "dense_layer"}
-            ],
-            "level_id": 2
-        }
-        
         success, response = self.run_test(
             "Level 2 Simulation",
             "POST",
             "api/simulate-build",
             200,
-            data=build_data,
-            expected_fields=["success", "score", "message"]
+            data_bytes=BUILD_DATA_L2_BYTES,
+            expected_fields=self._RESULT_FIELDS
         )
         
         if success:
             score = response.get("score", 0)
-            print(f"   ✓ Simulation score: {score:.2%}")
+            self._emit(f"   ✓ Simulation score: {score:.2%}")
             
             if "educational_feedback" in response:
-                print("   ✓ Educational feedback included")
+                self._emit("   ✓ Educational feedback included")
             
             if "visual_data" in response:
-                print("   ✓ Visual data included")
+                self._emit("   ✓ Visual data included")
         
         return success, response
 
     def test_level_4_simulation(self):
         """Test Level 4 mini-boss simulation"""
-        build_data = {
-            "components": [
-                {"name": "Neural Layer", "type": "layer", "id": "neural_layer"},
-                {"name": "Activation Function", "type": "function", "id": "activation_relu"},
-                {"name": "Dense Layer", "type": "layer", "id": "dense_layer"},
-                {"name": "Dropout", "type": "regularization", "id": "dropout"}
-            ],
-            "level_id": 4
-        }
-        
         success, response = self.run_test(
             "Level 4 Mini-Boss Simulation",
             "POST",
             "api/simulate-build",
             200,
-            data=build_data,
-            expected_fields=["success", "score", "message"]
+            data_bytes=BUILD_DATA_L4_BYTES,
+            expected_fields=self._RESULT_FIELDS
         )
         
         if success:
             score = response.get("score", 0)
-            print(f"   ✓ Mini-boss score: {score:.2%}")
+            self._emit(f"   ✓ Mini-boss score: {score:.2%}")
         
         return success, response
 
-    def run_all_tests(self):
-        """Run all enhanced API tests"""
-        print("🚀 Starting Enhanced Tensor Forge API Tests")
-        print("=" * 60)
-        
-        # Test core endpoints
-        self.test_health_check()
-        self.test_get_components()
-        
-        # Test level endpoints
-        self.test_get_level_2()
-        self.test_get_level_4()
-        
-        # Test enhanced features
-        self.test_hint_system()
-        self.test_progress_update()
-        self.test_get_progress()
-        
-        # Test level-specific simulations
-        self.test_level_2_simulation()
-        self.test_level_4_simulation()
-        
-        # Print summary
-        print("\n" + "=" * 60)
-        print("📊 ENHANCED TEST SUMMARY")
-        print("=" * 60)
-        print(f"Tests Run: {self.tests_run}")
-        print(f"Tests Passed: {self.tests_passed}")
-        print(f"Tests Failed: {self.tests_run - self.tests_passed}")
-        print(f"Success Rate: {(self.tests_passed/self.tests_run)*100:.1f}%")
-        
-        if self.tests_passed == self.tests_run:
-            print("\n🎉 All enhanced tests passed! Backend API is fully functional.")
-            return 0
-        else:
-            print(f"\n⚠️  {self.tests_run - self.tests_passed} test(s) failed. Check the issues above.")
-            return 1
+    # Independent tests run concurrently; tests sharing player state stay in order
+    TESTS = (
+        # Core endpoints
+        (test_health_check,),
+        (test_get_components,),
+        # Level endpoints
+        (test_get_level_2,),
+        (test_get_level_4,),
+        # Enhanced features
+        (test_hint_system,),
+        (test_progress_update, test_get_progress),
+        # Level-specific simulations
+        (test_level_2_simulation,),
+        (test_level_4_simulation,),
+    )
 
 def main():
     """Main test runner"""
-    base_url = "https://472b03e2-49c6-4e1d-a49b-f4a6b3bcb67a.preview.emergentagent.com"
-    if len(sys.argv) > 1:
-        base_url = sys.argv[1]
-    
-    print(f"Testing Enhanced Tensor Forge API at: {base_url}")
-    
-    tester = EnhancedTensorForgeAPITester(base_url)
-    return tester.run_all_tests()
+    return run_suite_main(EnhancedTensorForgeAPITester, "Enhanced Tensor Forge API")
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
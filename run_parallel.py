@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Tensor Forge Backend API Test Runner
+Runs the basic and enhanced API test suites side by side in separate processes
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from backend_test import TensorForgeAPITester
+from enhanced_backend_test import EnhancedTensorForgeAPITester
+from tester_base import parse_args
+
+SUITES = (TensorForgeAPITester, EnhancedTensorForgeAPITester)
+
+def run_suite(tester_class, base_url, options):
+    """Run one suite in a worker process and return its exit code"""
+    return tester_class(base_url, **options).run_all_tests()
+
+def main():
+    """Main test runner"""
+    base_url, options = parse_args(sys.argv)
+
+    print(f"Testing Tensor Forge API at: {base_url}")
+
+    # Each suite waits on remote I/O independently, so the total is ~the slower suite
+    with ProcessPoolExecutor(max_workers=len(SUITES)) as pool:
+        futures = [pool.submit(run_suite, suite, base_url, options) for suite in SUITES]
+        exit_codes = [future.result() for future in futures]
+
+    return max(exit_codes)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Tensor Forge Backend API Test Machinery
+Shared request, logging and reporting code for the API test suites
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BASE_URL = "https://472b03e2-49c6-4e1d-a49b-f4a6b3bcb67a.preview.emergentagent.com"
+
+# How long --cache keeps a GET response on disk
+CACHE_TTL_SECONDS = 3600
+
+# (connect, read) timeouts - separate so an unreachable host fails in seconds
+DEFAULT_TIMEOUT = (3.05, 10)
+FAST_FAIL_TIMEOUT = (1.0, 3.0)
+
+# Retry idempotent GETs on gateway errors immediately instead of failing on a single proxy
+# hiccup; POSTs are never resent, and a persistent error still reaches run_test as its status
+RETRY_POLICY = Retry(total=2, backoff_factor=0, status_forcelist=(502, 503, 504),
+                     allowed_methods=frozenset(['GET']), raise_on_status=False)
+
+class BaseAPITester:
+    """Runs a suite's ``TESTS`` against the API and reports the results.
+
+    Subclasses define their ``test_*`` methods and list them in ``TESTS`` as
+    sequences: sequences run concurrently, tests within one run in order.
+    """
+
+    TESTS = ()
+    TITLE = "Tensor Forge API Tests"
+    SUMMARY_TITLE = "TEST SUMMARY"
+    SUCCESS_MESSAGE = "All tests passed! Backend API is working correctly."
+    RULE_WIDTH = 50
+
+    # Response fields checked by run_test, shared by both suites
+    _HEALTH_FIELDS = frozenset({"status", "message"})
+    _LEVEL_FIELDS = frozenset({"id", "title", "description", "available_components"})
+    _RESULT_FIELDS = frozenset({"success", "score", "message"})
+
+    def __init__(self, base_url=DEFAULT_BASE_URL, use_cache=False, verbose=False, fast_fail=False):
+        self.base_url = base_url
+        self.timeout = FAST_FAIL_TIMEOUT if fast_fail else DEFAULT_TIMEOUT
+        self.use_cache = use_cache
+        self.verbose = verbose
+        self.tests_run = 0
+        self.tests_passed = 0
+        self.test_results = []
+        self._lock = threading.Lock()  # Tests log from worker threads
+        self._local = threading.local()  # Per-thread output buffer of the running test
+
+        # One pooled session so every test after the first reuses the keep-alive connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=RETRY_POLICY)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # Opt-in on-disk cache of idempotent GET responses for quick local re-runs
+        self._cache_path = f".{type(self).__name__}_cache.json"
+        self._get_cache = self._load_cache() if use_cache else {}
+
+    def close(self):
+        """Release pooled connections and persist the GET cache"""
+        self.session.close()
+        if self.use_cache:
+            with open(self._cache_path, "wb") as f:
+                f.write(orjson.dumps(self._get_cache))
+
+    def _load_cache(self):
+        """Load the unexpired GET responses cached by a previous run"""
+        try:
+            with open(self._cache_path, "rb") as f:
+                entries = orjson.loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {url: entry for url, entry in entries.items() if now - entry["cached_at"] < CACHE_TTL_SECONDS}
+
+    def _emit(self, line, detail=True):
+        """Queue a line of output for the running test (detail lines only with verbose)"""
+        if detail and not self.verbose:
+            return
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            sys.stdout.write(line + "\n")
+        else:
+            buffer.append(line)
+
+    def log_test(self, name, success, message="", response_data=None):
+        """Log test result"""
+        with self._lock:
+            self.tests_run += 1
+            if success:
+                self.tests_passed += 1
+                self._emit(f"✅ {name}: PASSED - {message}", detail=False)
+            else:
+                self._emit(f"❌ {name}: FAILED - {message}", detail=False)
+
+            self.test_results.append({
+                "test": name,
+                "success": success,
+                "message": message,
+                "response_data": response_data
+            })
+
+    def run_test(self, name, method, endpoint, expected_status, data=None, expected_fields=None,
+                 data_bytes=None):
+        """Run a single API test (``expected_fields`` is a frozenset; ``data_bytes`` is a pre-serialized JSON body, used instead of ``data``)"""
+        url = f"{self.base_url}/{endpoint}"
+        headers = {'Content-Type': 'application/json'}
+
+        self._emit(f"\n🔍 Testing {name}...")
+        self._emit(f"   URL: {url}")
+
+        try:
+            cacheable = method == 'GET' and self.use_cache
+            cached = self._get_cache.get(url) if cacheable else None
+            if cached is not None:
+                status_code, response_json = cached["status"], cached["body"]
+                self._emit(f"   Status: {status_code} (cached)")
+            else:
+                if method == 'GET':
+                    response = self.session.get(url, headers=headers, timeout=self.timeout)
+                elif method == 'POST':
+                    if data_bytes is None:
+                        data_bytes = orjson.dumps(data)
+                    response = self.session.post(url, data=data_bytes, headers=headers, timeout=self.timeout)
+                else:
+                    self.log_test(name, False, f"Unsupported method: {method}")
+                    return False, {}
+                status_code, response_json = response.status_code, None
+                self._emit(f"   Status: {status_code}")
+
+            # Check status code
+            if status_code != expected_status:
+                self.log_test(name, False, f"Expected status {expected_status}, got {status_code}")
+                return False, {}
+
+            # Parse JSON response
+            if response_json is None:
+                try:
+                    response_json = orjson.loads(response.content)
+                except orjson.JSONDecodeError:
+                    self.log_test(name, False, "Invalid JSON response")
+                    return False, {}
+                if cacheable:
+                    with self._lock:
+                        self._get_cache[url] = {"status": status_code, "body": response_json, "cached_at": time.time()}
+
+            # Check expected fields if provided
+            if expected_fields:
+                missing_fields = expected_fields - response_json.keys()
+                if missing_fields:
+                    self.log_test(name, False, f"Missing fields: {sorted(missing_fields)}")
+                    return False, response_json
+
+            self.log_test(name, True, "All checks passed", response_json)
+            return True, response_json
+
+        except requests.exceptions.RequestException as e:
+            self.log_test(name, False, f"Request failed: {str(e)}")
+            return False, {}
+        except Exception as e:
+            self.log_test(name, False, f"Unexpected error: {str(e)}")
+            return False, {}
+
+    def _run_concurrently(self, sequences):
+        """Run each sequence of tests on its own thread (tests within a sequence run in order)"""
+        def run_sequence(tests):
+            for test in tests:
+                # Buffer the test's output and write it in one call so concurrent tests don't interleave
+                self._local.buffer = []
+                try:
+                    test(self)
+                finally:
+                    lines, self._local.buffer = self._local.buffer, None
+                    if lines:
+                        sys.stdout.write("\n".join(lines) + "\n")
+
+        with ThreadPoolExecutor(max_workers=len(sequences)) as pool:
+            list(pool.map(run_sequence, sequences))
+
+    def run_all_tests(self):
+        """Run every test in the suite and print a summary (returns the exit code)"""
+        rule = "=" * self.RULE_WIDTH
+        print(f"🚀 Starting {self.TITLE}")
+        print(rule)
+
+        self._run_concurrently(self.TESTS)
+
+        self.close()
+
+        # Print summary
+        print("\n" + rule)
+        print(f"📊 {self.SUMMARY_TITLE}")
+        print(rule)
+        print(f"Tests Run: {self.tests_run}")
+        print(f"Tests Passed: {self.tests_passed}")
+        print(f"Tests Failed: {self.tests_run - self.tests_passed}")
+        print(f"Success Rate: {(self.tests_passed/self.tests_run)*100:.1f}%")
+
+        if self.tests_passed == self.tests_run:
+            print(f"\n🎉 {self.SUCCESS_MESSAGE}")
+            return 0
+        else:
+            print(f"\n⚠️  {self.tests_run - self.tests_passed} test(s) failed. Check the issues above.")
+            return 1
+
+def parse_args(argv):
+    """Base URL and tester options from the command line"""
+    args = [arg for arg in argv[1:] if not arg.startswith("-")]
+    base_url = args[0] if args else DEFAULT_BASE_URL
+    options = {
+        "use_cache": "--cache" in argv,  # Reuse GET responses from the last hour's runs
+        "verbose": "-v" in argv[1:],  # Per-request details; otherwise only results and summary
+        "fast_fail": "--fast-fail" in argv  # Tight timeouts for quick smoke runs
+    }
+    return base_url, options
+
+def main(tester_class, api_name):
+    """Run one suite against the URL given on the command line"""
+    base_url, options = parse_args(sys.argv)
+
+    print(f"Testing {api_name} at: {base_url}")
+
+    tester = tester_class(base_url, **options)
+    return tester.run_all_tests()